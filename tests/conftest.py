@@ -0,0 +1,14 @@
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def verlet():
+    spec = spec_from_file_location('verlet_solver', Path(__file__).parent.parent / 'verlet-solver.py')
+    module = sys.modules['verlet_solver'] = module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+@pytest.mark.parametrize('speed', [0.08, 12.0])
+def test_free_body_keeps_displacement_across_sub_step_changes(verlet, backend, speed):
+    solver = verlet.SOLVERS[backend](8, None, gravity=verlet.Vector([0, 0]), adaptive=True, max_sub_steps=64)
+    obj_id = solver.spawn([(0.0, 0.0)], 5, velocity=verlet.Vector([speed / 8, 0]))[0]
+
+    counts = set()
+    previous = solver.objects[obj_id].position.x
+    for _ in range(10):
+        solver.update(1 / 60)
+        counts.add(solver.sub_steps)
+        x = solver.objects[obj_id].position.x
+        assert x - previous == pytest.approx(speed)
+        previous = x
+
+    assert len(counts) > 1
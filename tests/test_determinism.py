@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+
+def run(verlet, backend, steps=30, **options):
+    build, params = verlet.BENCHMARKS['rope-1k']
+    solver = build(verlet.make_solver(backend, **options), **params)
+    hashes = verlet.StateHashes()
+    try:
+        for _ in range(steps):
+            solver.update(1 / 60)
+            hashes.record(solver)
+    finally:
+        if isinstance(solver, verlet.ParallelSolver):
+            solver.close()
+    return hashes.hashes
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_repeated_runs_hash_identically(verlet, backend):
+    assert run(verlet, backend) == run(verlet, backend)
+
+
+def test_state_checksum_tracks_positions(verlet):
+    solver = verlet.make_solver('numpy')
+    obj_id = solver.spawn([(375.0, 335.0)], 5)[0]
+    checksum = verlet.state_checksum(solver)
+    quantized = verlet.state_checksum(solver, 1e-6)
+
+    solver.objects[obj_id].position = verlet.Vector([375.0, 335.0 + 1e-9])
+    assert verlet.state_checksum(solver) != checksum
+    assert verlet.state_checksum(solver, 1e-6) == quantized
+
+
+@pytest.mark.parametrize('first, second', [('python', 'python'), ('numpy', 'parallel')])
+def test_compare_engines_agree(verlet, first, second):
+    assert verlet.compare_engines('pile-100', first, second, steps=60, workers=1, slabs=2) is None
+
+
+def test_divergence_finds_the_moved_body(verlet):
+    first = verlet.random_scene(verlet.make_solver('numpy'), 50)
+    second = verlet.random_scene(verlet.make_solver('numpy'), 50)
+    obj_id = list(second.objects)[7]
+    second.objects[obj_id].position = second.objects[obj_id].position + verlet.Vector([0.0, 0.25])
+
+    assert verlet.divergence(first, second) == (0.25, obj_id)
+
+
+def test_backend_options_only_give_array_backends_a_dtype(verlet):
+    assert verlet.backend_options('python', 'float32', workers=2) == {}
+    assert verlet.backend_options('numpy', 'float32', workers=2) == {'dtype': np.dtype('float32')}
+    assert verlet.backend_options('parallel', workers=2) == {'dtype': np.dtype('float64'), 'workers': 2}
+
+
+def test_compare_engines_steps_in_the_requested_dtype(verlet):
+    f64 = verlet.compare_engines('pile-100', 'python', 'numpy', steps=5)
+    f32 = verlet.compare_engines('pile-100', 'python', 'numpy', steps=5, dtype='float32')
+    assert f32['error'] != f64['error']
+
+
+@pytest.mark.parametrize('argv', [
+    ['--headless', '--backend', 'numpy', '--dtype', 'float32', '--deterministic'],
+    ['--compare', 'python', 'python', '--dtype', 'float32'],
+])
+def test_main_rejects_float32_it_cannot_honour(verlet, argv):
+    with pytest.raises(SystemExit):
+        verlet.main(argv)
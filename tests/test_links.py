@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+
+def test_color_edges_never_repeats_a_body_within_a_color(verlet):
+    rng = np.random.default_rng(9)
+    first, second = rng.integers(0, 40, (2, 300))
+    keep = first != second
+    first, second = first[keep].tolist(), second[keep].tolist()
+
+    colors = verlet.color_edges(first, second)
+
+    assert sorted(np.concatenate(colors).tolist()) == list(range(len(first)))
+    for edges in colors:
+        bodies = [first[i] for i in edges] + [second[i] for i in edges]
+        assert len(bodies) == len(set(bodies))
+
+
+@pytest.mark.parametrize('scene', ['cloth-40x40', 'rings-25'])
+def test_link_groups_are_independent(verlet, scene):
+    build, params = verlet.BENCHMARKS[scene]
+    solver = build(verlet.make_solver('numpy'), **params)
+
+    first, second, groups = solver.link_arrays()
+    assert sum(len(edges) for edges, _, _ in groups) == solver.link_count
+    for edges, a, b in groups:
+        assert (a == first[edges]).all() and (b == second[edges]).all()
+        bodies = np.concatenate((a, b))
+        assert len(np.unique(bodies)) == len(bodies)
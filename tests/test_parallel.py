@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.mark.parametrize('scene', ['pile-1k', 'rope-1k'])
+def test_parallel_solver_matches_array_solver(verlet, scene):
+    build, params = verlet.BENCHMARKS[scene]
+    reference = build(verlet.make_solver('numpy'), **params)
+    solver = build(verlet.make_solver('parallel', workers=2, slabs=3), **params)
+    solver.min_parallel = 0
+
+    try:
+        for _ in range(20):
+            reference.update(1 / 60)
+            solver.update(1 / 60)
+            assert verlet.divergence(reference, solver)[0] <= 1e-6
+    finally:
+        solver.close()
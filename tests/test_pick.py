@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+
+def bodies(solver):
+    ids = np.array(list(solver.objects))
+    rows = np.array([(*obj.position, obj.radius) for obj in solver.objects.values()])
+    return ids, rows
+
+
+def nearest(bodies, position, radius):
+    ids, rows = bodies
+    distance = np.hypot(rows[:, 0] - position.x, rows[:, 1] - position.y) - rows[:, 2]
+    i = int(distance.argmin())
+    return int(ids[i]) if distance[i] <= radius else None
+
+
+@pytest.mark.parametrize('radius', [0, 30])
+def test_pick_matches_nearest_body(verlet, radius):
+    rng = np.random.default_rng(3)
+    solver = verlet.SOLVERS['numpy'](4, None)
+    solver.spawn(rng.uniform(0, 400, (300, 2)), rng.uniform(2, 9, 300))
+    solver.spawn(rng.uniform(0, 400, (40, 2)), 6, is_static=True)
+
+    for _ in range(3):
+        solver.update(1 / 60)
+        current = bodies(solver)
+        for x, y in rng.uniform(-20, 420, (200, 2)):
+            point = verlet.Vector((x, y))
+            assert solver.pick(point, radius) == nearest(current, point, radius)
+
+    moved = next(iter(solver.objects))
+    solver.move_obj(moved, verlet.Vector((900, 900)))
+    assert solver.pick(verlet.Vector((900, 900))) == moved
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+@pytest.mark.parametrize('scene', ['pile-1k', 'cloth-40x40'])
+def test_pick_follows_bodies_moved_after_indexing(verlet, backend, scene):
+    build, params = verlet.BENCHMARKS[scene]
+    solver = build(verlet.make_solver(backend, 2, gravity=verlet.Vector([0, 20000])), **params)
+    rng = np.random.default_rng(1)
+
+    for _ in range(10):
+        solver.update(1 / 60)
+        current = bodies(solver)
+        for x, y in current[1][rng.integers(0, len(current[0]), 100), :2] + rng.uniform(-3, 3, (100, 2)):
+            point = verlet.Vector((x, y))
+            for radius in (0, 25):
+                assert solver.pick(point, radius) == nearest(current, point, radius)
@@ -0,0 +1,12 @@
+import pickle
+
+import pytest
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_pickled_solver_keeps_handles(verlet, backend):
+    solver = verlet.rope_scene(verlet.make_solver(backend), 5)
+    copy = pickle.loads(pickle.dumps(solver))
+
+    assert [copy.handle(obj) for obj in copy.objects.values()] == list(copy.objects)
+    assert (copy.link_rows() == solver.link_rows()).all()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+
+def state(solver):
+    return [
+        (*obj.position, *obj.position_old, obj.radius, obj.is_static) for obj in solver.objects.values()
+    ]
+
+
+def links(solver):
+    index = {obj_id: i for i, obj_id in enumerate(solver.objects)}
+    return [
+        (*(index[solver.handle(obj)] for obj in link.objects), link.length, link.stiffness, link.is_fixed)
+        for link in solver.links.values()
+    ]
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_snapshot_round_trip_keeps_bodies_and_links(verlet, backend, tmp_path):
+    solver = verlet.rope_scene(verlet.make_solver(backend), 20)
+    verlet.random_scene(solver, 30, seed=4)
+    solver.spawn([(375.0, 500.0)], 8, is_static=True, color='red')
+    for _ in range(5):
+        solver.update(1 / 60)
+
+    path = tmp_path / 'scene.bin'
+    verlet.save_snapshot(solver, str(path))
+    copy = verlet.load_snapshot(str(path), verlet.SOLVERS[backend])
+
+    assert state(copy) == state(solver)
+    assert [obj.color for obj in copy.objects.values()] == [obj.color for obj in solver.objects.values()]
+    assert links(copy) == links(solver)
+
+    solver.update(1 / 60)
+    copy.update(1 / 60)
+    assert state(copy) == state(solver)
+
+
+@pytest.mark.parametrize('count', [0, 25])
+def test_trajectory_round_trip(verlet, count, tmp_path):
+    solver = verlet.make_solver('numpy')
+    verlet.random_scene(solver, count, seed=2)
+
+    path = str(tmp_path / 'run.traj')
+    frames = []
+    with verlet.TrajectoryRecorder(path, count, chunk=2) as recorder:
+        for _ in range(5):
+            solver.update(1 / 60)
+            recorder.record(solver)
+            frames.append(np.array(solver.positions(), dtype=float).reshape(-1, 2))
+
+    trajectory = verlet.Trajectory(path)
+    assert len(trajectory) == 5
+    assert np.allclose(trajectory[:], np.array(frames, dtype=np.float32))
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def fresh(verlet, solver):
+    n = solver.count
+    return verlet.static_index(solver.position[:n], solver.radius[:n], solver.is_static[:n])
+
+
+def same(first, second):
+    return first[0] == second[0] and all((a == b).all() for a, b in zip(first[1:], second[1:]))
+
+
+def test_static_index_survives_dynamic_churn(verlet):
+    solver = verlet.random_scene(verlet.make_solver('numpy'), 200, seed=6)
+    statics = solver.spawn([(200.0 + 20 * i, 500.0) for i in range(10)], 6, is_static=True)
+    solver.update(1 / 60)
+    index = solver.statics
+
+    ids = solver.spawn([(375.0, 100.0), (390.0, 100.0)], 3)
+    solver.add_links(ids[:1], ids[1:])
+    solver.update(1 / 60)
+    assert solver.statics is index
+
+    solver.spawn([(375.0, 120.0)], 40)
+    assert same(solver.static_grid(), fresh(verlet, solver))
+
+    rng = np.random.default_rng(0)
+    for obj_id in rng.choice(list(solver.objects), 30, replace=False).tolist():
+        solver.remove_obj(obj_id)
+        assert same(solver.static_grid(), fresh(verlet, solver))
+
+    solver.remove_region(verlet.Vector([300.0, 500.0]), 50)
+    assert same(solver.static_grid(), fresh(verlet, solver))
+    solver.set_static(next(iter(solver.objects)), True)
+    assert same(solver.static_grid(), fresh(verlet, solver))
+    solver.move_obj(statics[-1], verlet.Vector([100.0, 100.0]))
+    assert same(solver.static_grid(), fresh(verlet, solver))
+
+
+def test_parallel_static_version_ignores_dynamic_spawns(verlet):
+    solver = verlet.random_scene(verlet.make_solver('parallel', workers=1, slabs=2), 100)
+    solver.spawn([(375.0, 500.0)], 6, is_static=True)
+    try:
+        solver.update(1 / 60)
+        version = solver.static_version
+        for _ in range(5):
+            solver.spawn([(375.0, 100.0)], 5)
+            solver.update(1 / 60)
+        assert solver.static_version == version
+    finally:
+        solver.close()
@@ -0,0 +1,13 @@
+import pytest
+
+
+def test_parse_grid_converts_values(verlet):
+    assert verlet.parse_grid(['scene=pile-100,rope-1k', 'gravity=0,1000']) == {
+        'scene': ['pile-100', 'rope-1k'], 'gravity': [0.0, 1000.0]
+    }
+
+
+@pytest.mark.parametrize('item', ['scene=nope', 'backend=python,fast', 'speed=1', 'gravity='])
+def test_parse_grid_rejects_unknown_values(verlet, item):
+    with pytest.raises(ValueError):
+        verlet.parse_grid([item])
@@ -0,0 +1,33 @@
+from time import perf_counter
+
+import pytest
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_removal_wakes_only_nearby_sleepers(verlet, backend):
+    solver = verlet.random_scene(verlet.make_solver(backend), 200, seed=5)
+    solver.update(1 / 60)
+    for obj in solver.objects.values():
+        obj.sleeping = True
+
+    center = verlet.Vector([375.0, 335.0])
+    solver.remove_region(center, 40)
+
+    for obj in solver.objects.values():
+        if (obj.position - center).length < 40 + obj.radius:
+            assert not obj.sleeping
+        elif (obj.position - center).length > 200:
+            assert obj.sleeping
+
+
+@pytest.mark.parametrize('stepped', [False, True])
+def test_huge_removal_region_stays_cheap(verlet, stepped):
+    solver = verlet.random_scene(verlet.make_solver('python'), 100)
+    if stepped:
+        solver.update(1 / 60)
+
+    start = perf_counter()
+    removed = solver.remove_region(verlet.Vector([375.0, 335.0]), 1e6)
+
+    assert len(removed) == 100
+    assert perf_counter() - start < 1
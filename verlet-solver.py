@@ -1,302 +1,3175 @@
-from tkinter import Tk, Canvas, Frame, Button, Checkbutton, IntVar, Scale, Menu, BooleanVar
-from time import time, sleep
-from threading import Thread
+from argparse import ArgumentParser
+from array import array
+from struct import Struct
+from sys import byteorder
+from json import dump, dumps
+from zlib import crc32
+from itertools import chain, product, repeat
+from collections.abc import Mapping
+from math import ceil, cos, sin, pi
+from platform import python_version
+from tracemalloc import start as trace_start, stop as trace_stop, get_traced_memory
+from random import Random
+from queue import Empty
+from time import time, perf_counter
+from os import cpu_count
+from weakref import finalize
+from multiprocessing import Pool, Process, Queue, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+try:
+    from tkinter import Tk, Canvas, Frame, Button, Checkbutton, IntVar, Scale, Menu, BooleanVar, PhotoImage
+except ImportError:
+    Tk = Canvas = Frame = Button = Checkbutton = IntVar = Scale = Menu = BooleanVar = PhotoImage = None
+
+try:
+    from socket import socket, AF_UNIX, SOCK_DGRAM
+except ImportError:
+    socket = AF_UNIX = SOCK_DGRAM = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Vector:
-    def __init__(self, values: list):
-        self._values: list = list(values)
+    __slots__ = ('x', 'y')
+
+    def __init__(self, values):
+        x, y = values
+        self.x: float = x
+        self.y: float = y
 
     def __str__(self):
-        return 'Vector({}, {})'.format(*self.values)
+        return f'Vector({self.x}, {self.y})'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __getitem__(self, index):
+        return (self.x, self.y)[index]
+
+    def __setitem__(self, index, value):
+        if index in (0, -2):
+            self.x = value
+        elif index in (1, -1):
+            self.y = value
+        else:
+            raise IndexError(index)
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __len__(self):
+        return 2
+
+    def __mul__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError
+
+        return Vector((self.x * other, self.y * other))
+
+    def __truediv__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError
+
+        return Vector((self.x / other, self.y / other))
+
+    def __pow__(self, power):
+        if not isinstance(power, (int, float)):
+            raise TypeError
+
+        return Vector((self.x ** power, self.y ** power))
+
+    def __add__(self, other):
+        if not isinstance(other, Vector):
+            raise TypeError
+
+        return Vector((self.x + other.x, self.y + other.y))
+
+    def __sub__(self, other):
+        if not isinstance(other, Vector):
+            raise TypeError
+
+        return Vector((self.x - other.x, self.y - other.y))
+
+    def __iadd__(self, other):
+        if not isinstance(other, Vector):
+            raise TypeError
+
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        if not isinstance(other, Vector):
+            raise TypeError
+
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError
+
+        self.x *= other
+        self.y *= other
+        return self
+
+    def __itruediv__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError
+
+        self.x /= other
+        self.y /= other
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector):
+            raise TypeError
+
+        return self.x == other.x and self.y == other.y
+
+    def set(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
+
+    def copy(self):
+        return Vector((self.x, self.y))
+
+    @property
+    def values(self):
+        return [self.x, self.y]
+
+    @property
+    def length(self):
+        return (self.x * self.x + self.y * self.y) ** 0.5
+
+
+ZERO_VECTOR = Vector([0, 0])
+
+
+class VerletObject:
+    __slots__ = ('position', 'position_old', 'radius', 'is_static', 'color', 'acceleration', 'sleeping', 'rest_frames')
+
+    def __init__(self, position: Vector, radius: int, is_static: bool, color: str = 'white'):
+        self.position: Vector = position.copy()
+        self.position_old: Vector = position.copy()
+
+        self.radius: int = radius
+        self.is_static: bool = is_static
+        self.color: str = color
+
+        self.acceleration = ZERO_VECTOR.copy()
+
+        self.sleeping: bool = False
+        self.rest_frames: int = 0
+
+    def update_position(self, dt: int) -> None:
+        position, position_old, acceleration = self.position, self.position_old, self.acceleration
+        x, y = position.x, position.y
+        dt2: float = dt * dt
+
+        position.x += x - position_old.x + acceleration.x * dt2
+        position.y += y - position_old.y + acceleration.y * dt2
+        position_old.set(x, y)
+
+        acceleration.set(0.0, 0.0)
+
+    def accelerate(self, acc: Vector):
+        self.acceleration += acc
+
+    def get_coords(self):
+        rel_coords = Vector(
+            [
+                self.radius,
+                self.radius
+            ]
+        )
+        ld = self.position - rel_coords
+        ru = self.position + rel_coords
+
+        return ld.values + ru.values
+
+
+class Link:
+    def __init__(
+            self,
+            objects: tuple[VerletObject, VerletObject], length: float, is_fixed: bool = True,
+            stiffness: float = 0.01
+    ):
+        self.objects: tuple[VerletObject, VerletObject] = objects
+        self.length: float = length
+        self.is_fixed: bool = is_fixed
+        self.stiffness: float = stiffness
+
+    def update(self):
+        obj1, obj2 = self.objects
+        p1, p2 = obj1.position, obj2.position
+
+        dx: float = p1.x - p2.x
+        dy: float = p1.y - p2.y
+        dist: float = (dx * dx + dy * dy) ** 0.5
+
+        if (self.is_fixed or dist > self.length) and dist != 0:
+            k: float = (self.length - dist) * self.stiffness / dist
+            dx *= k
+            dy *= k
+            if not obj1.is_static:
+                p1.x += dx
+                p1.y += dy
+            if not obj2.is_static:
+                p2.x -= dx
+                p2.y -= dy
+
+    def get_coords(self):
+        return [i for obj in self.objects for i in obj.position]
+
+
+class Constraint:
+    def __init__(self, radius: float, position: Vector):
+        self.radius: float = radius
+        self.position: Vector = position
+
+    def apply(self, obj: VerletObject) -> None:
+        position, center = obj.position, self.position
+        dx: float = position.x - center.x
+        dy: float = position.y - center.y
+        dist: float = (dx * dx + dy * dy) ** 0.5
+        limit: float = self.radius - obj.radius
+
+        if dist > limit:
+            k: float = limit / dist
+            position.set(center.x + dx * k, center.y + dy * k)
+
+    def get_coords(self):
+        rel_coords: Vector = Vector(
+            [
+                self.radius,
+                self.radius
+            ]
+        )
+        ld = self.position - rel_coords
+        ru = self.position + rel_coords
+
+        return ld.values + ru.values
+
+
+class UniformField:
+    def __init__(self, acceleration: Vector):
+        self.acceleration: Vector = acceleration.copy()
+
+    def apply(self, objects: list, dt: float) -> None:
+        ax, ay = self.acceleration
+
+        for obj in objects:
+            acceleration: Vector = obj.acceleration
+            acceleration.x += ax
+            acceleration.y += ay
+
+    def apply_arrays(self, pos, velocity, acc) -> None:
+        acc += self.acceleration.values
+
+
+class PointField:
+    def __init__(self, position: Vector, strength: float, radius: float = float('inf'), softening: float = 10):
+        self.position: Vector = position.copy()
+        self.strength: float = strength
+        self.radius: float = radius
+        self.softening: float = softening
+
+    def apply(self, objects: list, dt: float) -> None:
+        cx, cy = self.position
+        strength: float = self.strength
+        reach: float = self.radius * self.radius
+        soft: float = self.softening * self.softening
+
+        for obj in objects:
+            position: Vector = obj.position
+            dx: float = cx - position.x
+            dy: float = cy - position.y
+            d2: float = dx * dx + dy * dy
+            if d2 > reach:
+                continue
+
+            k: float = strength / (d2 + soft) ** 1.5
+            acceleration: Vector = obj.acceleration
+            acceleration.x += dx * k
+            acceleration.y += dy * k
+
+    def apply_arrays(self, pos, velocity, acc) -> None:
+        to_center = np.array(self.position.values) - pos
+        d2 = (to_center ** 2).sum(axis=1)
+        k = self.strength / (d2 + self.softening ** 2) ** 1.5
+        k[d2 > self.radius ** 2] = 0
+
+        acc += to_center * k[:, None]
+
+
+class DragField:
+    def __init__(self, coefficient: float):
+        self.coefficient: float = coefficient
+
+    def apply(self, objects: list, dt: float) -> None:
+        k: float = self.coefficient / dt
+
+        for obj in objects:
+            position, position_old, acceleration = obj.position, obj.position_old, obj.acceleration
+            acceleration.x -= (position.x - position_old.x) * k
+            acceleration.y -= (position.y - position_old.y) * k
+
+    def apply_arrays(self, pos, velocity, acc) -> None:
+        acc -= self.coefficient * velocity
+
+
+class WindField:
+    def __init__(self, origin: Vector, cell_size: float, velocities, coefficient: float = 1.0):
+        self.origin: Vector = origin.copy()
+        self.cell_size: float = cell_size
+        self.coefficient: float = coefficient
+
+        self.velocities: list = [[(float(vx), float(vy)) for vx, vy in row] for row in velocities]
+        self.rows: int = len(self.velocities)
+        self.columns: int = len(self.velocities[0])
+        self.grid = None if np is None else np.array(self.velocities, dtype=float)
+
+    def sample(self, x: float, y: float) -> tuple[float, float]:
+        gx: float = min(max((x - self.origin.x) / self.cell_size, 0), self.columns - 1)
+        gy: float = min(max((y - self.origin.y) / self.cell_size, 0), self.rows - 1)
+        x0, y0 = int(gx), int(gy)
+        x1, y1 = min(x0 + 1, self.columns - 1), min(y0 + 1, self.rows - 1)
+        fx, fy = gx - x0, gy - y0
+
+        top, bottom = self.velocities[y0], self.velocities[y1]
+        return (
+            (top[x0][0] * (1 - fx) + top[x1][0] * fx) * (1 - fy) + (bottom[x0][0] * (1 - fx) + bottom[x1][0] * fx) * fy,
+            (top[x0][1] * (1 - fx) + top[x1][1] * fx) * (1 - fy) + (bottom[x0][1] * (1 - fx) + bottom[x1][1] * fx) * fy
+        )
+
+    def apply(self, objects: list, dt: float) -> None:
+        k: float = self.coefficient
+
+        for obj in objects:
+            position, position_old, acceleration = obj.position, obj.position_old, obj.acceleration
+            wx, wy = self.sample(position.x, position.y)
+            acceleration.x += (wx - (position.x - position_old.x) / dt) * k
+            acceleration.y += (wy - (position.y - position_old.y) / dt) * k
+
+    def apply_arrays(self, pos, velocity, acc) -> None:
+        gx = np.clip((pos[:, 0] - self.origin.x) / self.cell_size, 0, self.columns - 1)
+        gy = np.clip((pos[:, 1] - self.origin.y) / self.cell_size, 0, self.rows - 1)
+        x0, y0 = gx.astype(np.intp), gy.astype(np.intp)
+        x1, y1 = np.minimum(x0 + 1, self.columns - 1), np.minimum(y0 + 1, self.rows - 1)
+        fx, fy = (gx - x0)[:, None], (gy - y0)[:, None]
+
+        grid = self.grid
+        wind = (grid[y0, x0] * (1 - fx) + grid[y0, x1] * fx) * (1 - fy) + (grid[y1, x0] * (1 - fx) + grid[y1, x1] * fx) * fy
+
+        acc += self.coefficient * (wind - velocity)
+
+
+def vortex_field(center: Vector, radius: float, speed: float, cell_size: float = 25, coefficient: float = 1.0) -> WindField:
+    cells: int = int(2 * radius / cell_size) + 1
+    origin: Vector = Vector([center.x - radius, center.y - radius])
+    velocities: list = []
+
+    for row in range(cells):
+        dy: float = origin.y + row * cell_size - center.y
+        velocities.append([])
+        for column in range(cells):
+            dx: float = origin.x + column * cell_size - center.x
+            distance: float = (dx * dx + dy * dy) ** 0.5 or 1
+            k: float = speed * min(distance / radius, 1) / distance
+            velocities[-1].append((-dy * k, dx * k))
+
+    return WindField(origin, cell_size, velocities, coefficient)
+
+
+class SpatialHash:
+    def __init__(self, cell_size: float = 1):
+        self.cell_size: float = cell_size
+        self.cells: dict[tuple[int, int], list] = {}
+
+    def cell(self, position: Vector) -> tuple[int, int]:
+        return int(position.x // self.cell_size), int(position.y // self.cell_size)
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def insert(self, item, position: Vector) -> None:
+        key = self.cell(position)
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [item]
+        else:
+            cell.append(item)
+
+    def rebuild(self, objects, cell_size: float) -> None:
+        self.cell_size = cell_size if cell_size > 0 else 1
+        self.cells.clear()
+        for obj in objects:
+            self.insert(obj, obj.position)
+
+    def nearby(self, position: Vector, reach: float):
+        cells = self.cells
+        if not cells:
+            return None
+
+        size: float = self.cell_size
+        x0, x1 = int((position.x - reach) // size), int((position.x + reach) // size)
+        y0, y1 = int((position.y - reach) // size), int((position.y + reach) // size)
+
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            for (x, y), cell in cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield from cell
+            return None
+
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cell = cells.get((x, y))
+                if cell is not None:
+                    yield from cell
+
+    def neighbours(self, position: Vector):
+        cx, cy = self.cell(position)
+        cells = self.cells
+
+        for x in range(cx - 1, cx + 2):
+            for y in range(cy - 1, cy + 2):
+                cell = cells.get((x, y))
+                if cell is not None:
+                    yield from cell
+
+
+class SolverStats:
+    phases: tuple = ('integrate', 'constraint', 'collisions', 'links', 'sleep', 'draw')
+    counters: tuple = ('pair_tests', 'contacts', 'sub_steps')
+
+    def __init__(self):
+        self.frames: int = 0
+        self.draws: int = 0
+
+        self.last: dict = dict.fromkeys(self.phases + self.counters, 0)
+        self.totals: dict = dict.fromkeys(self.phases + self.counters, 0)
+
+    def begin_frame(self) -> float:
+        last: dict = self.last
+        for name in last:
+            if name != 'draw':
+                last[name] = 0
+
+        return perf_counter()
+
+    def lap(self, phase: str, start: float) -> float:
+        now: float = perf_counter()
+        self.last[phase] += now - start
+
+        return now
+
+    def count(self, counter: str, value: int) -> None:
+        self.last[counter] += value
+
+    def end_frame(self) -> None:
+        totals: dict = self.totals
+        for name, value in self.last.items():
+            if name != 'draw':
+                totals[name] += value
+        self.frames += 1
+
+    def record_draw(self, start: float) -> None:
+        elapsed: float = perf_counter() - start
+        self.last['draw'] = elapsed
+        self.totals['draw'] += elapsed
+        self.draws += 1
+
+    def as_dict(self) -> dict:
+        frames: int = max(self.frames, 1)
+
+        return {
+            'frames': self.frames,
+            'last_ms': {phase: 1000 * self.last[phase] for phase in self.phases},
+            'mean_ms': {
+                phase: 1000 * self.totals[phase] / (max(self.draws, 1) if phase == 'draw' else frames)
+                for phase in self.phases
+            },
+            'last': {counter: self.last[counter] for counter in self.counters},
+            'mean': {counter: self.totals[counter] / frames for counter in self.counters},
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as file:
+            dump(self.as_dict(), file, indent=2)
+
+    def summary(self) -> str:
+        last: dict = self.last
+
+        return '\n'.join(
+            [f'{phase:<10} {1000 * last[phase]:7.2f} ms' for phase in self.phases]
+            + [f'{counter:<10} {last[counter]:7d}' for counter in self.counters]
+        )
+
+
+def find_islands(keys, edges) -> dict:
+    parent: dict = {key: key for key in keys}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for a, b in edges:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+
+    return {key: find(key) for key in parent}
+
+
+class Solver:
+    max_travel: float = 0.5
+    max_overlap: float = 0.25
+
+    def __init__(
+            self,
+            sub_steps: int = 1,
+            constraint: Constraint = None, canvas: Canvas = None,
+            gravity: Vector = Vector([0, 1000]),
+            sleep_threshold: float = 0.0, sleep_frames: int = 30,
+            link_iterations: int = 1,
+            adaptive: bool = False, min_sub_steps: int = 1, max_sub_steps: int = 16,
+            forces: list = None
+    ):
+        if sub_steps <= 0:
+            sub_steps = 1
+        self.sub_steps: int = sub_steps
+
+        self.adaptive: bool = adaptive
+        self.min_sub_steps: int = max(min_sub_steps, 1)
+        self.max_sub_steps: int = max(max_sub_steps, self.min_sub_steps)
+        self.max_penetration: float = 0.0
+
+        if link_iterations <= 0:
+            link_iterations = 1
+        self.link_iterations: int = link_iterations
+
+        self.sleep_threshold: float = sleep_threshold
+        self.sleep_frames: int = sleep_frames
+        self._islands: dict = None
+
+        self.constraint: Constraint = constraint
+        self.gravity: Vector = gravity.copy()
+        self.forces: list = list(forces or ())
+
+        self.objects: dict[int: VerletObject] = {}
+        self.links: dict = {}
+        self.handles: dict[int, int] = {}
+        self.object_links: dict[int, set] = {}
+        self._next_id: int = 0
+
+        self.grid: SpatialHash = SpatialHash()
+        self._grid_dirty: bool = True
+        self._dynamic: list = None
+
+        self.statics: SpatialHash = SpatialHash()
+        self.static_radius: float = 0.0
+        self._static_dirty: bool = True
+        self.stats: SolverStats = SolverStats()
+
+        self.observers: list = []
+        if canvas is not None:
+            self.attach(CanvasRenderer(canvas))
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state['handles'] = {}
+        state['_islands'] = None
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if isinstance(self.objects, dict):
+            self.handles = {id(obj): obj_id for obj_id, obj in self.objects.items()}
+
+    def update(self, dt: float) -> None:
+        if self.adaptive:
+            self.set_sub_steps(self.choose_sub_steps())
+        self.max_penetration = 0.0
+
+        dt /= self.sub_steps
+        stats: SolverStats = self.stats
+        start: float = stats.begin_frame()
+        stats.count('sub_steps', self.sub_steps)
+
+        for _ in range(self.sub_steps):
+            objects: list = self.dynamic()
+            awake: list = [obj for obj in objects if not obj.sleeping]
+
+            for field in self.forces:
+                field.apply(awake, dt)
+
+            gx, gy = self.gravity
+            for obj in awake:
+                acceleration: Vector = obj.acceleration
+                acceleration.x += gx
+                acceleration.y += gy
+                obj.update_position(dt)
+            start = stats.lap('integrate', start)
+
+            if not awake:
+                break
+
+            if self.constraint is not None:
+                for obj in awake:
+                    self.constraint.apply(obj)
+            start = stats.lap('constraint', start)
+
+            self.collide(objects)
+            self._grid_dirty = True
+            start = stats.lap('collisions', start)
+
+            for _ in range(self.link_iterations):
+                for L in self.links.values():
+                    obj1, obj2 = L.objects
+                    if obj1.sleeping and obj2.sleeping:
+                        continue
+                    L.update()
+            start = stats.lap('links', start)
+
+        if self.sleep_threshold > 0:
+            self.update_sleep()
+        stats.lap('sleep', start)
+        stats.end_frame()
+
+    def collide(self, objects) -> None:
+        if not objects:
+            return None
+
+        grid: SpatialHash = self.grid
+        self.rebuild_grid(objects)
+        statics: SpatialHash = self.static_grid()
+        static_radius: float = self.static_radius
+        tests: int = 0
+        contacts: int = 0
+        deepest: float = 0.0
+
+        for obj in objects:
+            if obj.sleeping:
+                continue
+
+            position: Vector = obj.position
+            radius: float = obj.radius
+
+            for obj2 in grid.neighbours(position):
+                tests += 1
+                position2: Vector = obj2.position
+                dx: float = position.x - position2.x
+                dy: float = position.y - position2.y
+                dist: float = (dx * dx + dy * dy) ** 0.5
+                min_dist: float = radius + obj2.radius
+                if dist < min_dist and dist != 0:
+                    contacts += 1
+                    if min_dist - dist > deepest:
+                        deepest = min_dist - dist
+                    if obj2.sleeping and self.is_moving(obj):
+                        self.wake_obj(obj2)
+
+                    k: float = (min_dist - dist) / 2 / dist
+                    dx *= k
+                    dy *= k
+                    position.x += dx
+                    position.y += dy
+                    if not obj2.sleeping:
+                        position2.x -= dx
+                        position2.y -= dy
+
+            if not statics.cells:
+                continue
+
+            for obj2 in statics.nearby(position, radius + static_radius):
+                tests += 1
+                position2: Vector = obj2.position
+                dx: float = position.x - position2.x
+                dy: float = position.y - position2.y
+                dist: float = (dx * dx + dy * dy) ** 0.5
+                min_dist: float = radius + obj2.radius
+                if dist < min_dist and dist != 0:
+                    contacts += 1
+                    if min_dist - dist > deepest:
+                        deepest = min_dist - dist
+
+                    k: float = (min_dist - dist) / 2 / dist
+                    position.x += dx * k
+                    position.y += dy * k
+
+        self.stats.count('pair_tests', tests)
+        self.stats.count('contacts', contacts)
+        self.max_penetration = max(self.max_penetration, deepest)
+
+    def dynamic(self) -> list:
+        if self._dynamic is None:
+            self._dynamic = [obj for obj in self.objects.values() if not obj.is_static]
+
+        return self._dynamic
+
+    def rebuild_grid(self, objects: list) -> None:
+        self.grid.rebuild(objects, 2 * max((obj.radius for obj in objects), default=0))
+        self._grid_dirty = False
+
+    def static_grid(self) -> SpatialHash:
+        if self._static_dirty:
+            statics: list = [obj for obj in self.objects.values() if obj.is_static]
+            self.static_radius = max((obj.radius for obj in statics), default=0)
+            self.statics.rebuild(statics, 2 * self.static_radius)
+            self._static_dirty = False
+
+        return self.statics
+
+    def motion(self) -> tuple[float, float]:
+        speed: float = 0.0
+        radius: float = float('inf')
+
+        for obj in self.objects.values():
+            if obj.radius < radius:
+                radius = obj.radius
+            if obj.is_static or obj.sleeping:
+                continue
+
+            dx: float = obj.position.x - obj.position_old.x
+            dy: float = obj.position.y - obj.position_old.y
+            if dx * dx + dy * dy > speed:
+                speed = dx * dx + dy * dy
+
+        return speed ** 0.5, radius
+
+    def kinetic_energy(self, dt: float) -> float:
+        energy: float = 0.0
+        for obj in self.objects.values():
+            if obj.is_static:
+                continue
+
+            dx: float = obj.position.x - obj.position_old.x
+            dy: float = obj.position.y - obj.position_old.y
+            energy += dx * dx + dy * dy
+
+        return energy / (2 * dt * dt)
+
+    def potential_energy(self) -> float:
+        gravity: Vector = self.gravity
+
+        return -sum(
+            gravity.x * obj.position.x + gravity.y * obj.position.y
+            for obj in self.objects.values() if not obj.is_static
+        )
+
+    def constraint_error(self) -> float:
+        error: float = 0.0
+
+        for link in self.links.values():
+            p1, p2 = link.objects[0].position, link.objects[1].position
+            dx: float = p1.x - p2.x
+            dy: float = p1.y - p2.y
+            stretch: float = (dx * dx + dy * dy) ** 0.5 - link.length
+            if link.is_fixed and stretch < 0:
+                stretch = -stretch
+            if stretch > error:
+                error = stretch
+
+        if self.constraint is not None:
+            center: Vector = self.constraint.position
+            limit: float = self.constraint.radius
+            for obj in self.dynamic():
+                dx: float = obj.position.x - center.x
+                dy: float = obj.position.y - center.y
+                outside: float = (dx * dx + dy * dy) ** 0.5 + obj.radius - limit
+                if outside > error:
+                    error = outside
+
+        return error
+
+    def set_sub_steps(self, sub_steps: int) -> None:
+        if sub_steps != self.sub_steps:
+            self.rescale_velocity(self.sub_steps / sub_steps)
+            self.sub_steps = sub_steps
+
+    def rescale_velocity(self, ratio: float) -> None:
+        for obj in self.dynamic():
+            position, position_old = obj.position, obj.position_old
+            position_old.set(
+                position.x - (position.x - position_old.x) * ratio,
+                position.y - (position.y - position_old.y) * ratio
+            )
+
+    def choose_sub_steps(self) -> int:
+        speed, radius = self.motion()
+        if not 0 < radius < float('inf'):
+            return self.sub_steps
+
+        travel: int = ceil(speed * self.sub_steps / (self.max_travel * radius))
+        overlap: int = ceil(self.max_penetration * self.sub_steps / (self.max_overlap * radius))
+
+        target: int = max(travel, overlap, self.sub_steps - 1)
+
+        return min(max(target, self.min_sub_steps), self.max_sub_steps)
+
+    def invalidate(self) -> None:
+        self._islands = None
+        self._dynamic = None
+        self._grid_dirty = True
+
+    def islands(self) -> dict:
+        if self._islands is None:
+            keys: dict = {id(obj): obj for obj in self.objects.values() if not obj.is_static}
+            roots: dict = find_islands(
+                keys,
+                (
+                    (id(obj1), id(obj2))
+                    for obj1, obj2 in (link.objects for link in self.links.values())
+                    if id(obj1) in keys and id(obj2) in keys
+                )
+            )
+
+            members: dict = {}
+            for key, root in roots.items():
+                members.setdefault(root, []).append(keys[key])
+            self._islands = {key: members[root] for key, root in roots.items()}
+
+        return self._islands
+
+    def is_moving(self, obj: VerletObject) -> bool:
+        dx: float = obj.position.x - obj.position_old.x
+        dy: float = obj.position.y - obj.position_old.y
+
+        return dx * dx + dy * dy >= self.sleep_threshold ** 2
+
+    def update_sleep(self) -> None:
+        ready: list = []
+
+        for obj in self.objects.values():
+            if obj.is_static or obj.sleeping:
+                continue
+
+            if not self.is_moving(obj):
+                obj.rest_frames += 1
+                if obj.rest_frames >= self.sleep_frames:
+                    ready.append(obj)
+            else:
+                obj.rest_frames = 0
+
+        islands: dict = self.islands()
+        for obj in ready:
+            if obj.sleeping:
+                continue
+
+            island: list = islands.get(id(obj), [obj])
+            if all(member.rest_frames >= self.sleep_frames for member in island):
+                for member in island:
+                    member.position_old = member.position.copy()
+                    member.sleeping = True
+
+    def set_static(self, id, is_static: bool) -> None:
+        obj = self.objects[id]
+        obj.is_static = is_static
+        obj.sleeping = False
+        obj.rest_frames = 0
+
+        self.invalidate()
+        self._static_dirty = True
+        self.wake_near(obj.position, obj.radius)
+
+    def wake(self, id) -> None:
+        if id in self.objects:
+            self.wake_obj(self.objects[id])
+
+    def wake_obj(self, obj: VerletObject) -> None:
+        if not obj.sleeping:
+            return None
+
+        if not self.object_links.get(self.handle(obj)):
+            obj.sleeping = False
+            obj.rest_frames = 0
+            return None
+
+        for member in self.islands().get(id(obj), [obj]):
+            member.sleeping = False
+            member.rest_frames = 0
+
+    def wake_near(self, position: Vector, radius: float = 0) -> None:
+        grid: SpatialHash = self.grid
+
+        for obj in grid.nearby(position, radius + 2 * grid.cell_size):
+            if not obj.sleeping:
+                continue
+
+            reach: float = radius + obj.radius + grid.cell_size
+            if (obj.position - position).length < reach:
+                self.wake_obj(obj)
+
+    def positions(self) -> list:
+        return [(obj.position.x, obj.position.y) for obj in self.objects.values()]
+
+    def state_rows(self):
+        return np.array(
+            [
+                (obj_id, obj.position.x, obj.position.y, obj.radius, obj.is_static, obj.sleeping)
+                for obj_id, obj in self.objects.items()
+            ],
+            dtype=float
+        ).reshape(-1, 6)
+
+    def link_rows(self):
+        return np.array(
+            [
+                (link_id, self.handle(link.objects[0]), self.handle(link.objects[1]))
+                for link_id, link in self.links.items()
+            ],
+            dtype=float
+        ).reshape(-1, 3)
+
+    def draw(self):
+        start: float = perf_counter()
+        for observer in self.observers:
+            observer.draw(self)
+        self.stats.record_draw(start)
+
+    def attach(self, observer) -> None:
+        self.observers.append(observer)
+
+        for id, obj in self.objects.items():
+            observer.on_add_obj(id, obj)
+        for id, link in self.links.items():
+            observer.on_add_link(id, link)
+
+    def detach(self, observer) -> None:
+        self.observers.remove(observer)
+
+    def new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def handle(self, obj):
+        return self.handles.get(id(obj))
+
+    def register(self, obj: VerletObject) -> int:
+        obj_id = self.new_id()
+        self.objects[obj_id] = obj
+        self.handles[id(obj)] = obj_id
+
+        return obj_id
+
+    def unregister(self, obj_id) -> None:
+        del self.handles[id(self.objects.pop(obj_id))]
+
+    def add_obj(self, obj: VerletObject) -> int:
+        obj_id = self.register(obj)
+        obj = self.objects[obj_id]
+        self.invalidate()
+        if obj.is_static:
+            self._static_dirty = True
+
+        for observer in self.observers:
+            observer.on_add_obj(obj_id, obj)
+
+        return obj_id
+
+    def remove_obj(self, obj_id):
+        if obj_id in self.objects:
+            for link_id in self.links_of(obj_id):
+                self.remove_link(link_id)
+            self.object_links.pop(obj_id, None)
+
+            obj = self.objects[obj_id]
+            position, radius, is_static = obj.position, obj.radius, obj.is_static
+            self.unregister(obj_id)
+
+            self.invalidate()
+            if is_static:
+                self._static_dirty = True
+            self.wake_near(position, radius)
+
+            for observer in self.observers:
+                observer.on_remove_obj(obj_id)
+
+    def move_obj(self, obj_id, position: Vector) -> None:
+        obj = self.objects[obj_id]
+        obj.position = position.copy()
+        for observer in self.observers:
+            observer.on_move_obj(obj_id, obj)
+
+        if obj.is_static:
+            self._static_dirty = True
+        else:
+            self._grid_dirty = True
+        self.wake_near(obj.position, obj.radius)
+
+    def pick(self, position: Vector, radius: float = 0):
+        if not self.objects:
+            return None
+
+        grid: SpatialHash = self.grid
+        if self._grid_dirty:
+            self.rebuild_grid(self.dynamic())
+        statics: SpatialHash = self.static_grid()
+
+        best = None
+        best_distance: float = radius
+        for obj in chain(
+                grid.nearby(position, radius + grid.cell_size),
+                statics.nearby(position, radius + self.static_radius)
+        ):
+            distance: float = (obj.position - position).length - obj.radius
+            if distance <= best_distance:
+                best, best_distance = obj, distance
+
+        return None if best is None else self.handle(best)
+
+    def spawn(
+            self, positions, radius=5, is_static: bool = False, color: str = 'white',
+            velocity: Vector = None
+    ) -> list:
+        radii = radius if hasattr(radius, '__iter__') else repeat(radius)
+        ids: list = []
+
+        for (x, y), r in zip(positions, radii):
+            obj = VerletObject(Vector((x, y)), r, is_static, color)
+            if velocity is not None:
+                obj.position_old -= velocity
+
+            obj_id = self.register(obj)
+            ids.append(obj_id)
+
+            for observer in self.observers:
+                observer.on_add_obj(obj_id, obj)
+
+        self.invalidate()
+        if is_static:
+            self._static_dirty = True
+
+        return ids
+
+    def remove_region(self, center: Vector, radius: float) -> list:
+        removed: list = [
+            obj_id for obj_id, obj in self.objects.items()
+            if (obj.position - center).length < radius
+        ]
+        for obj_id in removed:
+            for link_id in self.links_of(obj_id):
+                self.remove_link(link_id)
+            self.object_links.pop(obj_id, None)
+        for obj_id in removed:
+            if self.objects[obj_id].is_static:
+                self._static_dirty = True
+            self.unregister(obj_id)
+            for observer in self.observers:
+                observer.on_remove_obj(obj_id)
+
+        self.invalidate()
+        self.wake_near(center, radius)
+
+        return removed
+
+    def add_link(self, link: Link) -> int:
+        for obj in link.objects:
+            if self.handle(obj) is None:
+                self.add_obj(obj)
+
+        link_id = self.new_id()
+        self.links[link_id] = link
+        for obj in link.objects:
+            self.object_links.setdefault(self.handle(obj), set()).add(link_id)
+
+        self.invalidate()
+        for obj in link.objects:
+            self.wake_obj(obj)
+
+        for observer in self.observers:
+            observer.on_add_link(link_id, link)
+
+        return link_id
+
+    def add_links(self, first, second, length=None, stiffness=0.01, is_fixed=True) -> list:
+        lengths = length if hasattr(length, '__iter__') else repeat(length)
+        stiffnesses = stiffness if hasattr(stiffness, '__iter__') else repeat(stiffness)
+        fixed = is_fixed if hasattr(is_fixed, '__iter__') else repeat(is_fixed)
+        ids: list = []
+
+        for obj_id1, obj_id2, rest, k, rigid in zip(first, second, lengths, stiffnesses, fixed):
+            obj1, obj2 = self.objects[obj_id1], self.objects[obj_id2]
+            if rest is None:
+                rest = (obj1.position - obj2.position).length
+            ids.append(self.add_link(Link((obj1, obj2), rest, bool(rigid), k)))
+
+        return ids
+
+    def remove_link(self, link_id):
+        if link_id in self.links:
+            link = self.links.pop(link_id)
+            for obj in link.objects:
+                attached = self.object_links.get(self.handle(obj))
+                if attached is not None:
+                    attached.discard(link_id)
+
+            self.invalidate()
+            for obj in link.objects:
+                self.wake_obj(obj)
+
+            for observer in self.observers:
+                observer.on_remove_link(link_id)
+
+    def links_of(self, obj_id) -> list:
+        return list(self.object_links.get(obj_id, ()))
+
+    def linked(self, obj_id) -> list:
+        return [self.links[link_id] for link_id in self.links_of(obj_id)]
+
+
+class CanvasRenderer:
+    def __init__(self, canvas: Canvas, min_move: float = 0.5):
+        self.canvas: Canvas = canvas
+        self.min_move: float = min_move
+
+        self.items: dict[int, int] = {}
+        self.lines: dict[int, int] = {}
+
+        self.drawn: dict[int, tuple[float, float, float]] = {}
+        self.drawn_lines: dict[int, list] = {}
+        self.moved: set[int] = set()
+
+    def on_add_obj(self, id: int, obj: VerletObject) -> None:
+        item = self.canvas.create_oval(
+            *obj.get_coords(),
+            fill=obj.color
+        )
+        self.items[id] = item
+        self.drawn[id] = (*obj.position, obj.radius)
+
+    def on_remove_obj(self, id: int) -> None:
+        item = self.items.pop(id, None)
+        if item is not None:
+            del self.drawn[id]
+            self.moved.discard(id)
+            self.canvas.delete(item)
+
+    def on_move_obj(self, id: int, obj: VerletObject) -> None:
+        self.moved.add(id)
+
+    def on_add_link(self, id: int, link: Link) -> None:
+        coords = link.get_coords()
+        self.lines[id] = self.canvas.create_line(
+            *coords,
+            fill='grey'
+        )
+        self.drawn_lines[id] = coords
+
+    def on_remove_link(self, id: int) -> None:
+        item = self.lines.pop(id, None)
+        if item is not None:
+            del self.drawn_lines[id]
+            self.canvas.delete(item)
+
+    def draw(self, solver: Solver) -> None:
+        path: str = str(self.canvas)
+        min_move: float = self.min_move
+        commands: list = []
+
+        drawn = self.drawn
+        moved = self.moved
+        resting: set = set()
+        for id, obj in solver.objects.items():
+            if (obj.is_static or obj.sleeping) and id not in moved:
+                resting.add(id)
+                continue
+
+            x, y = obj.position
+            r = obj.radius
+
+            last = drawn[id]
+            if abs(x - last[0]) < min_move and abs(y - last[1]) < min_move and r == last[2]:
+                continue
+
+            drawn[id] = (x, y, r)
+            commands.append(f'{path} coords {self.items[id]} {x - r} {y - r} {x + r} {y + r}')
+
+        moved.clear()
+
+        handle = solver.handle
+        drawn_lines = self.drawn_lines
+        for id, link in solver.links.items():
+            first, second = link.objects
+            if handle(first) in resting and handle(second) in resting:
+                continue
+
+            coords = link.get_coords()
+
+            last = drawn_lines[id]
+            if all(abs(c - l) < min_move for c, l in zip(coords, last)):
+                continue
+
+            drawn_lines[id] = coords
+            commands.append(f'{path} coords {self.lines[id]} {" ".join(map(str, coords))}')
+
+        if commands:
+            self.canvas.tk.eval('\n'.join(commands))
+
+    def outline(self, id: int, color: str) -> None:
+        item = self.items.get(id)
+        if item is not None:
+            self.canvas.itemconfig(item, outline=color)
+
+    def clear(self) -> None:
+        for item in chain(self.items.values(), self.lines.values()):
+            self.canvas.delete(item)
+
+        self.items.clear()
+        self.lines.clear()
+        self.drawn.clear()
+        self.drawn_lines.clear()
+        self.moved.clear()
+
+
+class RasterRenderer:
+    def __init__(self, canvas: Canvas, outline: str = 'black', link_color: str = 'grey'):
+        if np is None:
+            raise ImportError('RasterRenderer requires numpy')
+
+        self.canvas: Canvas = canvas
+
+        self.rgb: dict[str, tuple] = {}
+        self.colors: dict[int, str] = {}
+        self.outlines: dict[int, str] = {}
+        self.outline_color: str = outline
+        self.link_color: str = link_color
+
+        self.stamps: dict[int, tuple] = {}
+        self.ids = None
+        self.fill = None
+        self.edge = None
+
+        self.size: tuple[int, int] = None
+        self.constraint: Constraint = None
+        self.base = None
+        self.frame = None
+        self.photo = None
+        self.item: int = None
+
+    def on_add_obj(self, id: int, obj: VerletObject) -> None:
+        self.colors[id] = obj.color
+        self.ids = None
+
+    def on_remove_obj(self, id: int) -> None:
+        self.colors.pop(id, None)
+        self.outlines.pop(id, None)
+        self.ids = None
+
+    def on_move_obj(self, id: int, obj: VerletObject) -> None:
+        pass
+
+    def on_add_link(self, id: int, link: Link) -> None:
+        pass
+
+    def on_remove_link(self, id: int) -> None:
+        pass
+
+    def outline(self, id: int, color: str) -> None:
+        if id in self.colors:
+            self.outlines[id] = color
+            self.ids = None
+
+    def clear(self) -> None:
+        if self.item is not None:
+            self.canvas.delete(self.item)
+
+        self.item = None
+        self.photo = None
+        self.size = None
+
+    def color(self, name: str) -> tuple:
+        if name not in self.rgb:
+            self.rgb[name] = tuple(channel >> 8 for channel in self.canvas.winfo_rgb(name))
+
+        return self.rgb[name]
+
+    def stamp(self, radius: int) -> tuple:
+        if radius not in self.stamps:
+            dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+            distance = dx * dx + dy * dy
+            disc = distance <= radius * radius
+            ring = disc & (distance > (radius - 1) ** 2)
+            self.stamps[radius] = (dy[disc], dx[disc]), (dy[ring], dx[ring])
+
+        return self.stamps[radius]
+
+    def canvas_size(self) -> tuple[int, int]:
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            width, height = int(self.canvas.cget('width')), int(self.canvas.cget('height'))
+
+        return width, height
+
+    def reset(self, size: tuple[int, int], constraint: Constraint) -> None:
+        width, height = size
+        self.size = size
+        self.constraint = constraint
+
+        self.base = np.empty((height, width, 3), dtype=np.uint8)
+        self.base[:] = self.color(self.canvas.cget('background'))
+        if constraint is not None:
+            self.paint(
+                self.base, np.array([tuple(constraint.position)]), np.array([constraint.radius]),
+                np.array([self.color('black')], dtype=np.uint8), np.array([self.color('black')], dtype=np.uint8)
+            )
+        self.frame = self.base.copy()
+
+        self.photo = PhotoImage(master=self.canvas, width=width, height=height)
+        if self.item is None:
+            self.item = self.canvas.create_image(0, 0, image=self.photo, anchor='nw')
+        else:
+            self.canvas.itemconfig(self.item, image=self.photo)
+
+    def paint(self, frame, centers, radius, fill, edge) -> None:
+        height, width = frame.shape[:2]
+        pixels = frame.reshape(-1, 3)
+
+        cx, cy = np.rint(centers).astype(np.int64).T
+        sizes = np.maximum(np.rint(radius).astype(np.int64), 1)
+
+        for size in np.unique(sizes).tolist():
+            chosen = np.flatnonzero(sizes == size)
+            for (dy, dx), colors in zip(self.stamp(size), (fill[chosen], edge[chosen])):
+                px = cx[chosen, None] + dx
+                py = cy[chosen, None] + dy
+                inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                pixels[(py * width + px)[inside]] = np.broadcast_to(colors[:, None], px.shape + (3,))[inside]
+
+    def paint_links(self, frame, ids, centers, links) -> None:
+        height, width = frame.shape[:2]
+        order = np.argsort(ids)
+        ends = np.searchsorted(ids, links[:, 1:], sorter=order).clip(0, len(ids) - 1)
+        ends = order[ends]
+        known = (ids[ends] == links[:, 1:]).all(axis=1)
+        if not known.any():
+            return None
+
+        start, end = centers[ends[known, 0]], centers[ends[known, 1]]
+        span = end - start
+        samples = np.ceil(np.hypot(span[:, 0], span[:, 1])).astype(np.int64) + 1
+
+        step = np.arange(samples.sum()) - np.repeat(np.cumsum(samples) - samples, samples)
+        t = step / np.repeat(np.maximum(samples - 1, 1), samples)
+        points = np.rint(np.repeat(start, samples, axis=0) + np.repeat(span, samples, axis=0) * t[:, None])
+
+        px, py = points.astype(np.int64).T
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        frame.reshape(-1, 3)[(py * width + px)[inside]] = self.color(self.link_color)
+
+    def draw(self, solver: Solver) -> None:
+        size: tuple = self.canvas_size()
+        if size != self.size or solver.constraint is not self.constraint:
+            self.reset(size, solver.constraint)
+
+        frame = self.frame
+        frame[:] = self.base
+
+        rows = solver.state_rows()
+        if len(rows):
+            ids = rows[:, 0].astype(np.int64)
+            if self.ids is None or not np.array_equal(ids, self.ids):
+                self.ids = ids
+                self.fill = np.array([self.color(self.colors.get(i, 'white')) for i in ids.tolist()], dtype=np.uint8)
+                self.edge = np.array(
+                    [self.color(self.outlines.get(i, self.outline_color)) for i in ids.tolist()], dtype=np.uint8
+                )
+
+            centers = rows[:, 1:3]
+            self.paint(frame, centers, rows[:, 3], self.fill, self.edge)
+
+            links = solver.link_rows()
+            if len(links):
+                self.paint_links(frame, ids, centers, links.astype(np.int64))
+
+        width, height = size
+        self.photo.configure(data=b'P6 %d %d 255 ' % (width, height) + frame.tobytes(), format='PPM')
+
+
+class ObjectView:
+    __slots__ = ('solver', 'obj_id')
+
+    def __init__(self, solver, obj_id: int):
+        self.solver = solver
+        self.obj_id: int = obj_id
+
+    @property
+    def index(self) -> int:
+        return int(self.solver.slots[self.obj_id])
+
+    @property
+    def color(self) -> str:
+        return self.solver.palette[self.solver.colors[self.index]]
+
+    @color.setter
+    def color(self, value: str) -> None:
+        self.solver.colors[self.index] = self.solver.color_index(value)
+
+    @property
+    def position(self) -> Vector:
+        return Vector(self.solver.position[self.index].tolist())
+
+    @position.setter
+    def position(self, value: Vector) -> None:
+        self.solver.position[self.index] = tuple(value)
+
+    @property
+    def position_old(self) -> Vector:
+        return Vector(self.solver.position_old[self.index].tolist())
+
+    @position_old.setter
+    def position_old(self, value: Vector) -> None:
+        self.solver.position_old[self.index] = tuple(value)
+
+    @property
+    def acceleration(self) -> Vector:
+        return Vector(self.solver.acceleration[self.index].tolist())
+
+    @acceleration.setter
+    def acceleration(self, value: Vector) -> None:
+        self.solver.acceleration[self.index] = tuple(value)
+
+    @property
+    def radius(self) -> float:
+        return float(self.solver.radius[self.index])
+
+    @radius.setter
+    def radius(self, value: float) -> None:
+        self.solver.radius[self.index] = value
+        self.solver.cover_radius(value)
+
+    @property
+    def is_static(self) -> bool:
+        return bool(self.solver.is_static[self.index])
+
+    @is_static.setter
+    def is_static(self, value: bool) -> None:
+        self.solver.is_static[self.index] = value
+
+    @property
+    def sleeping(self) -> bool:
+        return bool(self.solver.sleeping[self.index])
+
+    @sleeping.setter
+    def sleeping(self, value: bool) -> None:
+        self.solver.sleeping[self.index] = value
+
+    @property
+    def rest_frames(self) -> int:
+        return int(self.solver.rest_frames[self.index])
+
+    @rest_frames.setter
+    def rest_frames(self, value: int) -> None:
+        self.solver.rest_frames[self.index] = value
+
+    def update_position(self, dt: float) -> None:
+        solver = self.solver
+        i: int = self.index
+
+        velocity = solver.position[i] - solver.position_old[i]
+        solver.position_old[i] = solver.position[i]
+        solver.position[i] += velocity + solver.acceleration[i] * dt * dt
+        solver.acceleration[i] = 0
+
+    def accelerate(self, acc: Vector) -> None:
+        self.solver.acceleration[self.index] += tuple(acc)
+
+    def get_coords(self):
+        x, y = self.solver.position[self.index].tolist()
+        r: float = self.radius
+
+        return [x - r, y - r, x + r, y + r]
+
+
+class LinkView:
+    __slots__ = ('solver', 'link_id')
+
+    def __init__(self, solver, link_id: int):
+        self.solver = solver
+        self.link_id: int = link_id
+
+    @property
+    def index(self) -> int:
+        return int(self.solver.link_slots[self.link_id])
+
+    @property
+    def objects(self) -> tuple[ObjectView, ObjectView]:
+        solver = self.solver
+        i: int = self.index
+
+        return ObjectView(solver, int(solver.link_first[i])), ObjectView(solver, int(solver.link_second[i]))
+
+    @property
+    def length(self) -> float:
+        return float(self.solver.link_length[self.index])
+
+    @length.setter
+    def length(self, value: float) -> None:
+        self.solver.link_length[self.index] = value
+
+    @property
+    def stiffness(self) -> float:
+        return float(self.solver.link_stiffness[self.index])
+
+    @stiffness.setter
+    def stiffness(self, value: float) -> None:
+        self.solver.link_stiffness[self.index] = value
+
+    @property
+    def is_fixed(self) -> bool:
+        return bool(self.solver.link_fixed[self.index])
+
+    @is_fixed.setter
+    def is_fixed(self, value: bool) -> None:
+        self.solver.link_fixed[self.index] = value
+
+    def get_coords(self):
+        solver = self.solver
+        i: int = self.index
+
+        return solver.position[solver.slots[[solver.link_first[i], solver.link_second[i]]]].ravel().tolist()
+
+
+def color_edges(first, second) -> list:
+    colors: list = []
+    used: dict = {}
+
+    for edge, pair in enumerate(zip(first, second)):
+        taken: set = used.setdefault(pair[0], set()) | used.setdefault(pair[1], set())
+        color: int = 0
+        while color in taken:
+            color += 1
+
+        if color == len(colors):
+            colors.append([])
+        colors[color].append(edge)
+        used[pair[0]].add(color)
+        used[pair[1]].add(color)
+
+    return [np.array(edges, dtype=np.int64) for edges in colors]
+
+
+CELL_OFFSET: int = 1 << 20
+CELL_STRIDE: int = 1 << 21
+
+
+def cell_keys(positions, cell_size: float):
+    cells = np.floor(positions / cell_size).astype(np.int64) + CELL_OFFSET
+    return cells[:, 0] * CELL_STRIDE + cells[:, 1]
+
+
+def match_cells(keys, sorted_keys, offset: int) -> tuple:
+    target = keys + offset
+    lo = np.searchsorted(sorted_keys, target, 'left')
+    counts = np.searchsorted(sorted_keys, target, 'right') - lo
+
+    ends = np.cumsum(counts)
+    first = np.repeat(np.arange(len(keys)), counts)
+    found = np.arange(int(ends[-1]) if len(ends) else 0) - np.repeat(ends - counts - lo, counts)
+
+    return first, found
+
+
+def static_index(pos, radius, is_static) -> tuple:
+    indices = np.flatnonzero(is_static)
+
+    cell_size = 2 * float(radius.max(initial=0))
+    if cell_size <= 0:
+        cell_size = 1
+    keys = cell_keys(pos[indices], cell_size)
+    order = np.argsort(keys, kind='stable')
+
+    return cell_size, indices[order], keys[order]
+
+
+def grid_index(pos, radius, subset) -> tuple:
+    cell_size = 2 * float(radius[subset].max(initial=0))
+    if cell_size <= 0:
+        cell_size = 1
+    keys = cell_keys(pos[subset], cell_size)
+
+    return cell_size, keys, np.argsort(keys, kind='stable')
+
+
+def cell_query(index: tuple, point, radius: float):
+    cell_size, indices, sorted_keys = index
+    span: int = ceil((radius + cell_size / 2) / cell_size)
+    steps = np.arange(-span, span + 1)
+
+    targets = cell_keys(np.array([point], dtype=float), cell_size) + (steps[:, None] * CELL_STRIDE + steps).ravel()
+    lo = np.searchsorted(sorted_keys, targets, 'left').tolist()
+    hi = np.searchsorted(sorted_keys, targets, 'right').tolist()
+
+    return np.concatenate([indices[a:b] for a, b in zip(lo, hi)])
+
+
+def grid_pairs(pos, radius, subset, index: tuple = None) -> tuple:
+    if not len(subset):
+        return subset, subset
+
+    cell_size, keys, order = grid_index(pos, radius, subset) if index is None else index
+    sorted_keys = keys[order]
+
+    firsts, seconds = [], []
+    for offset in (0, 1, CELL_STRIDE - 1, CELL_STRIDE, CELL_STRIDE + 1):
+        first, found = match_cells(keys, sorted_keys, offset)
+        second = order[found]
+
+        if offset == 0:
+            keep = first < second
+            first, second = first[keep], second[keep]
+
+        firsts.append(subset[first])
+        seconds.append(subset[second])
+
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def static_pairs(pos, subset, index: tuple) -> tuple:
+    cell_size, indices, sorted_keys = index
+    if not len(indices) or not len(subset):
+        return subset[:0], subset[:0]
+
+    keys = cell_keys(pos[subset], cell_size)
+
+    firsts, seconds = [], []
+    for dx in (-CELL_STRIDE, 0, CELL_STRIDE):
+        for dy in (-1, 0, 1):
+            first, found = match_cells(keys, sorted_keys, dx + dy)
+            firsts.append(subset[first])
+            seconds.append(indices[found])
+
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def find_contacts(pos, radius, first, second, active) -> tuple:
+    axis = pos[first] - pos[second]
+    dist = np.hypot(axis[:, 0], axis[:, 1])
+    min_dist = radius[first] + radius[second]
+
+    hit = (dist < min_dist) & (dist != 0) & (active[first] | active[second])
+    overlap = min_dist[hit] - dist[hit]
+    shift = axis[hit] * (overlap / 2 / dist[hit])[:, None]
+
+    return first[hit], second[hit], shift, overlap
+
+
+def contact_delta(first, second, shift, active, n: int):
+    push, pull = active[first], active[second]
+
+    delta = np.empty((n, 2))
+    for k in range(2):
+        delta[:, k] = np.bincount(first[push], shift[push, k], n) - np.bincount(second[pull], shift[pull, k], n)
+
+    return delta
+
+
+class BodyTable(Mapping):
+    __slots__ = ('solver',)
+    view: type = ObjectView
+    count: str = 'count'
+    ids: str = 'ids'
+    slots: str = 'slots'
+
+    def __init__(self, solver):
+        self.solver = solver
+
+    def __len__(self) -> int:
+        return getattr(self.solver, self.count)
+
+    def __iter__(self):
+        return iter(getattr(self.solver, self.ids)[:len(self)].tolist())
+
+    def __contains__(self, key) -> bool:
+        return self.solver.index_of(key, self.slots) is not None
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+
+        return self.view(self.solver, key)
+
+    def values(self):
+        return (self.view(self.solver, key) for key in self)
+
+    def items(self):
+        return ((key, self.view(self.solver, key)) for key in self)
+
+
+class LinkTable(BodyTable):
+    __slots__ = ()
+    view: type = LinkView
+    count: str = 'link_count'
+    ids: str = 'link_ids'
+    slots: str = 'link_slots'
+
+
+class ArraySolver(Solver):
+    fields: tuple = (
+        'position', 'position_old', 'acceleration', 'radius', 'is_static', 'sleeping', 'rest_frames', 'ids', 'colors'
+    )
+    link_fields: tuple = ('link_ids', 'link_first', 'link_second', 'link_length', 'link_stiffness', 'link_fixed')
+
+    def __init__(self, *args, capacity: int = 64, dtype=float, **kwargs):
+        if np is None:
+            raise ImportError('ArraySolver requires numpy')
+
+        super().__init__(*args, **kwargs)
+
+        self._link_arrays: tuple = None
+        self.cells: tuple = None
+        self.indexed: tuple = None
+        self.drift: float = None
+
+        self.count: int = 0
+        self.objects: BodyTable = BodyTable(self)
+        self.slots = np.full(capacity, -1, dtype=np.int32)
+        self.palette: list[str] = []
+        self.palette_index: dict[str, int] = {}
+
+        self.position = np.zeros((capacity, 2), dtype=dtype)
+        self.position_old = np.zeros((capacity, 2), dtype=dtype)
+        self.acceleration = np.zeros((capacity, 2), dtype=dtype)
+        self.radius = np.zeros(capacity, dtype=dtype)
+        self.is_static = np.zeros(capacity, dtype=bool)
+        self.sleeping = np.zeros(capacity, dtype=bool)
+        self.rest_frames = np.zeros(capacity, dtype=np.int32)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.colors = np.zeros(capacity, dtype=np.int16)
+
+        self.link_count: int = 0
+        self.links: LinkTable = LinkTable(self)
+        self.link_slots = np.full(capacity, -1, dtype=np.int32)
+
+        self.link_ids = np.zeros(capacity, dtype=np.int64)
+        self.link_first = np.zeros(capacity, dtype=np.int64)
+        self.link_second = np.zeros(capacity, dtype=np.int64)
+        self.link_length = np.zeros(capacity, dtype=dtype)
+        self.link_stiffness = np.zeros(capacity, dtype=dtype)
+        self.link_fixed = np.zeros(capacity, dtype=bool)
+
+    def index_of(self, key, table: str = 'slots'):
+        slots = getattr(self, table)
+        if not isinstance(key, (int, np.integer)) or not 0 <= key < len(slots):
+            return None
+
+        i: int = int(slots[key])
+        return i if i >= 0 else None
+
+    def handle(self, obj):
+        if isinstance(obj, ObjectView) and obj.solver is self and obj.obj_id in self.objects:
+            return obj.obj_id
+
+        return None
+
+    def color_index(self, color: str) -> int:
+        if color not in self.palette_index:
+            self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+
+        return self.palette_index[color]
+
+    def place(self, ids, indices, table: str = 'slots') -> None:
+        slots = getattr(self, table)
+        needed: int = int(ids.max(initial=0)) + 1 if isinstance(ids, np.ndarray) else ids + 1
+        if needed > len(slots):
+            grown = np.full(max(needed, 2 * len(slots)), -1, dtype=np.int32)
+            grown[:len(slots)] = slots
+            setattr(self, table, grown)
+            slots = grown
+
+        slots[ids] = indices
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= len(self.radius):
+            return None
+
+        capacity = max(capacity, 2 * len(self.radius))
+        for name in self.fields:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def reserve_links(self, capacity: int) -> None:
+        if capacity <= len(self.link_ids):
+            return None
+
+        capacity = max(capacity, 2 * len(self.link_ids))
+        for name in self.link_fields:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.link_count] = old[:self.link_count]
+            setattr(self, name, new)
+
+    def update(self, dt: float) -> None:
+        if self.adaptive:
+            self.set_sub_steps(self.choose_sub_steps())
+        self.max_penetration = 0.0
+
+        dt /= self.sub_steps
+        gravity = np.array(self.gravity.values, dtype=float)
+        stats: SolverStats = self.stats
+        start: float = stats.begin_frame()
+        stats.count('sub_steps', self.sub_steps)
+
+        for _ in range(self.sub_steps):
+            n: int = self.count
+            if not n:
+                break
+
+            pos = self.position[:n]
+            active = ~(self.is_static[:n] | self.sleeping[:n])
+            if not active.any():
+                break
+
+            self.integrate(pos, active, gravity, dt)
+            start = stats.lap('integrate', start)
+            if self.constraint is not None:
+                self.apply_constraint(pos, active)
+            start = stats.lap('constraint', start)
+            self.collide_arrays(pos, active)
+            start = stats.lap('collisions', start)
+            if self.links:
+                self.solve_links(pos)
+            start = stats.lap('links', start)
+
+        if self.sleep_threshold > 0:
+            self.update_sleep()
+        stats.lap('sleep', start)
+        stats.end_frame()
+
+    def integrate(self, pos, dynamic, gravity, dt: float) -> None:
+        old = self.position_old[:len(pos)]
+        acc = self.acceleration[:len(pos)]
+
+        moving = pos[dynamic]
+        step = moving - old[dynamic]
+        force = acc[dynamic] + gravity
+        if self.forces:
+            velocity = step / dt
+            for field in self.forces:
+                field.apply_arrays(moving, velocity, force)
+
+        old[dynamic] = moving
+        pos[dynamic] = moving + (step + force * dt * dt)
+        acc[dynamic] = 0
+
+    def apply_constraint(self, pos, dynamic) -> None:
+        constraint: Constraint = self.constraint
+        center = np.array(constraint.position.values, dtype=float)
+        limit = constraint.radius - self.radius[:len(pos)]
+
+        to_obj = pos - center
+        dist = np.hypot(to_obj[:, 0], to_obj[:, 1])
+
+        outside = dynamic & (dist > limit) & (dist > 0)
+        pos[outside] = center + to_obj[outside] * (limit[outside] / dist[outside])[:, None]
+
+    def static_grid(self) -> tuple:
+        if self._static_dirty:
+            n: int = self.count
+            self.statics = static_index(self.position[:n], self.radius[:n], self.is_static[:n])
+            self._static_dirty = False
+
+        return self.statics
+
+    def index_cells(self, pos, movable) -> tuple:
+        cell_size, keys, order = index = grid_index(pos, self.radius, movable)
+        self.cells = (cell_size, movable[order], keys[order])
+        self.indexed = (movable, pos[movable])
+        self.drift = None
+
+        return index
+
+    def cell_drift(self) -> float:
+        if self.drift is None:
+            movable, indexed = self.indexed
+            self.drift = float(np.abs(self.position[movable] - indexed).max(initial=0))
+
+        return self.drift
+
+    def contact_pairs(self, pos, dynamic) -> tuple:
+        movable = np.flatnonzero(~self.is_static[:len(pos)])
+        first, second = grid_pairs(pos, self.radius, movable, self.index_cells(pos, movable))
+        static_first, static_second = static_pairs(pos, movable[dynamic[movable]], self.static_grid())
+
+        return np.concatenate((first, static_first)), np.concatenate((second, static_second))
+
+    def wake_contacts(self, pos, first, second) -> None:
+        if self.sleep_threshold <= 0 or not len(first):
+            return None
+
+        sleeping = self.sleeping[:len(pos)]
+        moving = self.moving(pos)
+        woken = np.concatenate(
+            (
+                second[moving[first] & sleeping[second]],
+                first[moving[second] & sleeping[first]]
+            )
+        )
+        if len(woken):
+            self.wake_indices(woken)
+
+    def collide_arrays(self, pos, dynamic) -> None:
+        first, second = self.contact_pairs(pos, dynamic)
+        self.stats.count('pair_tests', len(first))
+
+        first, second, shift, overlap = find_contacts(pos, self.radius, first, second, dynamic)
+        self.stats.count('contacts', len(first))
+        if not len(first):
+            return None
 
-    def __repr__(self):
-        return self.__str__()
+        self.max_penetration = max(self.max_penetration, float(overlap.max()))
+        self.wake_contacts(pos, first, second)
 
-    def __getitem__(self, index):
-        return self.values.__getitem__(index)
+        pos += contact_delta(first, second, shift, dynamic, len(pos))
 
-    def __setitem__(self, index, value):
-        return self._values.__setitem__(index, value)
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._link_arrays = None
+        self.cells = None
 
-    def __iter__(self):
-        return self._values.__iter__()
+    def cover_radius(self, radius: float) -> None:
+        if not self._static_dirty and 2 * radius > self.statics[0]:
+            self._static_dirty = True
 
-    def __mul__(self, other):
-        result = self.copy()
+    def link_arrays(self) -> tuple:
+        if self._link_arrays is None:
+            m: int = self.link_count
+            first = self.slots[self.link_first[:m]].astype(np.int64)
+            second = self.slots[self.link_second[:m]].astype(np.int64)
 
-        if not isinstance(other, (int, float)):
-            raise TypeError
+            groups: list = [(edges, first[edges], second[edges]) for edges in color_edges(first.tolist(), second.tolist())]
+            self._link_arrays = (first, second, groups)
 
-        for i in range(2):
-            result[i] *= other
+        return self._link_arrays
 
-        return result
+    def solve_links(self, pos) -> None:
+        _, _, groups = self.link_arrays()
+        m: int = self.link_count
+        length, stiffness, fixed = self.link_length[:m], self.link_stiffness[:m], self.link_fixed[:m]
+        n: int = len(pos)
+        movable = ~(self.is_static[:n] | self.sleeping[:n])
 
-    def __truediv__(self, other):
-        result = self.copy()
+        for _ in range(self.link_iterations):
+            for edges, a, b in groups:
+                axis = pos[a] - pos[b]
+                dist = np.hypot(axis[:, 0], axis[:, 1])
+                rest = length[edges]
 
-        if not isinstance(other, (int, float)):
-            raise TypeError
+                tense = (fixed[edges] | (dist > rest)) & (dist != 0)
+                k = np.divide((rest - dist) * stiffness[edges], dist, out=np.zeros_like(dist), where=tense)
+                shift = axis * k[:, None]
 
-        for i in range(2):
-            result[i] /= other
+                pos[a] += shift * movable[a][:, None]
+                pos[b] -= shift * movable[b][:, None]
 
-        return result
+    def positions(self):
+        return self.position[:self.count]
 
-    def __pow__(self, power):
-        result = self.copy()
+    def state_rows(self):
+        n: int = self.count
+        return np.column_stack(
+            (self.ids[:n], self.position[:n], self.radius[:n], self.is_static[:n], self.sleeping[:n])
+        ).reshape(-1, 6)
 
-        if not isinstance(power, (int, float)):
-            raise TypeError
+    def motion(self) -> tuple[float, float]:
+        n: int = self.count
+        if not n:
+            return 0.0, float('inf')
 
-        for i in range(2):
-            result[i] **= power
+        active = ~(self.is_static[:n] | self.sleeping[:n])
+        velocity = self.position[:n][active] - self.position_old[:n][active]
+        speed: float = float(np.sqrt((velocity ** 2).sum(axis=1).max(initial=0)))
 
-        return result
+        return speed, float(self.radius[:n].min())
 
-    def __add__(self, other):
-        result = self.copy()
+    def kinetic_energy(self, dt: float) -> float:
+        n: int = self.count
+        dynamic = ~self.is_static[:n]
+        velocity = self.position[:n][dynamic] - self.position_old[:n][dynamic]
 
-        if not isinstance(other, Vector):
-            raise TypeError
+        return float((velocity ** 2).sum()) / (2 * dt * dt)
 
-        for i in range(2):
-            result[i] += other.values[i]
+    def potential_energy(self) -> float:
+        n: int = self.count
+        dynamic = ~self.is_static[:n]
 
-        return result
+        return -float((self.position[:n][dynamic] @ np.array(self.gravity.values, dtype=float)).sum())
 
-    def __sub__(self, other):
-        result = self.copy()
+    def rescale_velocity(self, ratio: float) -> None:
+        n: int = self.count
+        dynamic = ~self.is_static[:n]
+        pos = self.position[:n][dynamic]
+        self.position_old[:n][dynamic] = pos - (pos - self.position_old[:n][dynamic]) * ratio
 
-        if not isinstance(other, Vector):
-            raise TypeError
+    def constraint_error(self) -> float:
+        n, m = self.count, self.link_count
+        error: float = 0.0
 
-        for i in range(2):
-            result[i] -= other.values[i]
+        if m:
+            first, second, _ = self.link_arrays()
+            axis = self.position[first] - self.position[second]
+            stretch = np.hypot(axis[:, 0], axis[:, 1]) - self.link_length[:m]
+            error = float(np.where(self.link_fixed[:m], np.abs(stretch), stretch).max())
 
-        return result
+        if self.constraint is not None and n:
+            offset = self.position[:n] - tuple(self.constraint.position)
+            outside = np.hypot(offset[:, 0], offset[:, 1]) + self.radius[:n] - self.constraint.radius
+            error = max(error, float(outside[~self.is_static[:n]].max(initial=0)))
 
-    def __eq__(self, other):
-        if not isinstance(other, Vector):
-            raise TypeError
+        return max(error, 0.0)
+
+    def moving(self, pos):
+        velocity = pos - self.position_old[:len(pos)]
+
+        return (velocity ** 2).sum(axis=1) >= self.sleep_threshold ** 2
+
+    def islands(self):
+        if self._islands is None:
+            n: int = self.count
+            first, second, _ = self.link_arrays()
+            loose = ~(self.is_static[first] | self.is_static[second])
+            roots: dict = find_islands(range(n), zip(first[loose].tolist(), second[loose].tolist()))
+            self._islands = np.fromiter((roots[i] for i in range(n)), dtype=np.int64, count=n)
+
+        return self._islands
+
+    def update_sleep(self) -> None:
+        n: int = self.count
+        active = ~(self.is_static[:n] | self.sleeping[:n])
+        resting = active & ~self.moving(self.position[:n])
+
+        rest_frames = self.rest_frames[:n]
+        rest_frames[resting] += 1
+        rest_frames[active & ~resting] = 0
+
+        labels = self.islands()
+        restless = np.bincount(labels[active & (rest_frames < self.sleep_frames)], minlength=n)
+        asleep = active & (restless[labels] == 0)
+        if asleep.any():
+            self.position_old[:n][asleep] = self.position[:n][asleep]
+            self.sleeping[:n][asleep] = True
 
-        return self.values == other.values
+    def wake_obj(self, obj: ObjectView) -> None:
+        self.wake_indices(np.array([obj.index]))
 
-    def copy(self):
-        return Vector(self.values.copy())
+    def wake_indices(self, indices) -> None:
+        if not self.sleeping[indices].any():
+            return None
 
-    @property
-    def values(self):
-        return self._values.copy()
+        labels = self.islands()
+        island = np.isin(labels, labels[indices])
+
+        self.sleeping[:self.count][island] = False
+        self.rest_frames[:self.count][island] = 0
+
+    def wake_near(self, position: Vector, radius: float = 0) -> None:
+        n: int = self.count
+        reach = radius + self.radius[:n] + 2 * self.radius[:n].max(initial=0)
+        offset = self.position[:n] - tuple(position)
+
+        near = self.sleeping[:n] & ((offset ** 2).sum(axis=1) < reach ** 2)
+        if near.any():
+            self.wake_indices(np.flatnonzero(near))
+
+    def spawn(
+            self, positions, radius=5, is_static: bool = False, color: str = 'white',
+            velocity: Vector = None
+    ) -> list:
+        if not isinstance(positions, np.ndarray):
+            positions = list(positions)
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+
+        k: int = len(positions)
+        i: int = self.count
+        self.reserve(i + k)
+
+        self.position[i:i + k] = positions
+        self.position_old[i:i + k] = positions if velocity is None else positions - tuple(velocity)
+        self.acceleration[i:i + k] = 0
+        self.radius[i:i + k] = np.fromiter(radius, float, k) if hasattr(radius, '__iter__') else radius
+        self.is_static[i:i + k] = is_static
+        self.sleeping[i:i + k] = False
+        self.rest_frames[i:i + k] = 0
+        self.colors[i:i + k] = self.color_index(color)
+
+        ids = np.arange(self._next_id + 1, self._next_id + k + 1)
+        self._next_id += k
+        self.ids[i:i + k] = ids
+        self.place(ids, np.arange(i, i + k))
+        self.count += k
+        if is_static:
+            self._static_dirty = True
+        self.cover_radius(float(self.radius[i:i + k].max(initial=0)))
+
+        ids: list = ids.tolist()
+        for observer in self.observers:
+            for obj_id in ids:
+                observer.on_add_obj(obj_id, ObjectView(self, obj_id))
+
+        self.invalidate()
+
+        return ids
+
+    def remove_region(self, center: Vector, radius: float) -> list:
+        n: int = self.count
+        offset = self.position[:n] - tuple(center)
+        inside = (offset ** 2).sum(axis=1) < radius ** 2
+        if not inside.any():
+            return []
+
+        indices = np.flatnonzero(inside)
+        removed: list = self.ids[indices].tolist()
+        m: int = self.link_count
+        self.drop_links(np.isin(self.link_first[:m], removed) | np.isin(self.link_second[:m], removed))
+
+        if self.is_static[indices[0]:n].any():
+            self._static_dirty = True
+        keep = ~inside
+        m: int = n - len(indices)
+        for name in self.fields:
+            array = getattr(self, name)
+            array[:m] = array[:n][keep]
+
+        self.slots[removed] = -1
+        self.slots[self.ids[:m]] = np.arange(m)
+        self.count = m
+
+        for obj_id in removed:
+            for observer in self.observers:
+                observer.on_remove_obj(obj_id)
+
+        self.invalidate()
+        self.wake_near(center, radius)
+
+        return removed
+
+    def pick(self, position: Vector, radius: float = 0):
+        n: int = self.count
+        if not n:
+            return None
 
-    @property
-    def length(self):
-        f, s = self.values
-        return (f ** 2 + s ** 2) ** 0.5
+        if self.cells is None:
+            self.index_cells(self.position[:n], np.flatnonzero(~self.is_static[:n]))
+        point: tuple = tuple(position)
+        candidates = np.concatenate(
+            (cell_query(self.cells, point, radius + self.cell_drift()), cell_query(self.static_grid(), point, radius))
+        )
+        if not len(candidates):
+            return None
 
+        offset = self.position[candidates] - point
+        distance = np.hypot(offset[:, 0], offset[:, 1]) - self.radius[candidates]
+        i: int = int(distance.argmin())
+
+        return int(self.ids[candidates[i]]) if distance[i] <= radius else None
+
+    def move_obj(self, obj_id, position: Vector) -> None:
+        super().move_obj(obj_id, position)
+        self.cells = None
+
+    def register(self, obj: VerletObject) -> int:
+        i: int = self.count
+        self.reserve(i + 1)
+
+        self.position[i] = tuple(obj.position)
+        self.position_old[i] = tuple(obj.position_old)
+        self.acceleration[i] = tuple(obj.acceleration)
+        self.radius[i] = obj.radius
+        self.is_static[i] = obj.is_static
+        self.sleeping[i] = False
+        self.rest_frames[i] = 0
+        self.colors[i] = self.color_index(obj.color)
+
+        obj_id: int = self.new_id()
+        self.ids[i] = obj_id
+        self.place(obj_id, i)
+        self.count += 1
+        self.cover_radius(obj.radius)
+
+        return obj_id
+
+    def unregister(self, obj_id) -> None:
+        i, last = self.index_of(obj_id), self.count - 1
+        if self.is_static[i] or self.is_static[last]:
+            self._static_dirty = True
+        if i != last:
+            for name in self.fields:
+                array = getattr(self, name)
+                array[i] = array[last]
+            self.slots[self.ids[i]] = i
+
+        self.slots[obj_id] = -1
+        self.count -= 1
+
+    def add_link(self, link: Link) -> int:
+        ends: list = []
+        for obj in link.objects:
+            obj_id = self.handle(obj)
+            ends.append(self.add_obj(obj) if obj_id is None else obj_id)
+
+        return self.add_links(ends[:1], ends[1:], link.length, link.stiffness, link.is_fixed)[0]
+
+    def add_links(self, first, second, length=None, stiffness=0.01, is_fixed=True) -> list:
+        first = np.asarray(first, dtype=np.int64).reshape(-1)
+        second = np.asarray(second, dtype=np.int64).reshape(-1)
+        k: int = len(first)
+        if not k:
+            return []
+
+        a, b = self.slots[first], self.slots[second]
+        if (a < 0).any() or (b < 0).any():
+            raise KeyError('links need live bodies at both ends')
+        if length is None:
+            offset = self.position[a] - self.position[b]
+            length = np.hypot(offset[:, 0], offset[:, 1])
+
+        j: int = self.link_count
+        self.reserve_links(j + k)
+
+        ids = np.arange(self._next_id + 1, self._next_id + k + 1)
+        self._next_id += k
+        self.link_ids[j:j + k] = ids
+        self.link_first[j:j + k] = first
+        self.link_second[j:j + k] = second
+        self.link_length[j:j + k] = length
+        self.link_stiffness[j:j + k] = stiffness
+        self.link_fixed[j:j + k] = is_fixed
+        self.place(ids, np.arange(j, j + k), 'link_slots')
+        self.link_count += k
+
+        self.invalidate()
+        self.wake_indices(np.concatenate((a, b)))
+
+        ids: list = ids.tolist()
+        for observer in self.observers:
+            for link_id in ids:
+                observer.on_add_link(link_id, LinkView(self, link_id))
+
+        return ids
+
+    def remove_link(self, link_id):
+        j = self.index_of(link_id, 'link_slots')
+        if j is None:
+            return None
 
-ZERO_VECTOR = Vector([0, 0])
+        ends = self.slots[[self.link_first[j], self.link_second[j]]]
+        last: int = self.link_count - 1
+        if j != last:
+            for name in self.link_fields:
+                array = getattr(self, name)
+                array[j] = array[last]
+            self.link_slots[self.link_ids[j]] = j
 
+        self.link_slots[link_id] = -1
+        self.link_count -= 1
 
-class VerletObject:
-    def __init__(self, position: Vector, radius: int, is_static: bool, color: str = 'white'):
-        self.position: Vector = position.copy()
-        self.position_old: Vector = position.copy()
+        self.invalidate()
+        self.wake_indices(ends[ends >= 0])
 
-        self.radius: int = radius
-        self.is_static: bool = is_static
-        self.color: str = color
+        for observer in self.observers:
+            observer.on_remove_link(link_id)
 
-        self.acceleration = ZERO_VECTOR.copy()
+    def drop_links(self, cut) -> None:
+        if not cut.any():
+            return None
 
-    def __eq__(self, other):
-        if not isinstance(other, VerletObject):
-            raise TypeError
+        m: int = self.link_count
+        dropped: list = self.link_ids[:m][cut].tolist()
+        kept: int = m - len(dropped)
+        for name in self.link_fields:
+            array = getattr(self, name)
+            array[:kept] = array[:m][~cut]
 
-        return all(
-            (
-                s == o for s, o in (
-                    (self.position, other.position),
-                    (self.radius, other.radius),
-                    (self.is_static, other.is_static),
-                    (self.color, other.color),
+        self.link_slots[dropped] = -1
+        self.link_slots[self.link_ids[:kept]] = np.arange(kept)
+        self.link_count = kept
+        self.invalidate()
+
+        for link_id in dropped:
+            for observer in self.observers:
+                observer.on_remove_link(link_id)
+
+    def links_of(self, obj_id) -> list:
+        m: int = self.link_count
+        attached = (self.link_first[:m] == obj_id) | (self.link_second[:m] == obj_id)
+
+        return self.link_ids[:m][attached].tolist()
+
+    def link_rows(self):
+        m: int = self.link_count
+        return np.column_stack((self.link_ids[:m], self.link_first[:m], self.link_second[:m])).reshape(-1, 3)
+
+
+SLAB_STATE: dict = {}
+
+
+def attach_arrays(layout: tuple) -> dict:
+    if SLAB_STATE.get('layout') != layout:
+        SLAB_STATE.clear()
+        blocks: list = [SharedMemory(name) for _, name, _, _ in layout]
+        SLAB_STATE['arrays'] = {
+            field: np.ndarray(shape, dtype, block.buf)
+            for (field, _, shape, dtype), block in zip(layout, blocks)
+        }
+        SLAB_STATE['blocks'] = blocks
+        SLAB_STATE['layout'] = layout
+
+    return SLAB_STATE['arrays']
+
+
+def solve_slab(task: tuple) -> tuple:
+    layout, n, version, edges, slab, reach = task
+    arrays: dict = attach_arrays(layout)
+
+    pos = arrays['position'][:n]
+    radius = arrays['radius'][:n]
+    is_static = arrays['is_static'][:n]
+    sleeping = arrays['sleeping'][:n]
+    active = ~(is_static | sleeping)
+
+    if SLAB_STATE.get('version') != version:
+        SLAB_STATE['statics'] = static_index(pos, radius, is_static)
+        SLAB_STATE['version'] = version
+
+    x = pos[:, 0]
+    owned = ~is_static & (np.searchsorted(edges[1:-1], x, 'right') == slab)
+    near = np.flatnonzero(~is_static & (x >= edges[slab] - reach) & (x < edges[slab + 1] + reach))
+
+    first, second = grid_pairs(pos, radius, near)
+    keep = owned[first] | owned[second]
+    static_first, static_second = static_pairs(pos, np.flatnonzero(owned & active), SLAB_STATE['statics'])
+    first = np.concatenate((first[keep], static_first))
+    second = np.concatenate((second[keep], static_second))
+    tests: int = int(owned[first].sum())
+
+    first, second, shift, overlap = find_contacts(pos, radius, first, second, active)
+    delta = contact_delta(first, second, shift, active, n)
+    arrays['delta'][:n][owned] = delta[owned]
+
+    counted = owned[first]
+    waking = counted & (sleeping[first] | sleeping[second])
+
+    return tests, int(counted.sum()), float(overlap[counted].max(initial=0)), first[waking], second[waking]
+
+
+def release_shared(pool, blocks: list) -> None:
+    if pool is not None:
+        pool.terminate()
+
+    for block in blocks:
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ParallelSolver(ArraySolver):
+    shared: tuple = ('position', 'radius', 'is_static', 'sleeping', 'delta')
+    min_parallel: int = 1000
+
+    def __init__(self, *args, workers: int = None, slabs: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.workers: int = workers or cpu_count() or 1
+        self.slabs: int = slabs or self.workers
+        self.static_version: int = 0
+
+        self.blocks: list[SharedMemory] = []
+        self.current: dict = {}
+        self.layout: tuple = ()
+        self.share()
+
+        self.pool = Pool(self.workers) if self.slabs > 1 else None
+        self.finalizer = finalize(self, release_shared, self.pool, self.blocks)
+
+    def close(self) -> None:
+        self.finalizer()
+
+    def share(self) -> None:
+        self.delta = np.zeros((len(self.radius), 2), dtype=self.position.dtype)
+
+        for name in self.shared:
+            old = getattr(self, name)
+            block: SharedMemory = SharedMemory(create=True, size=max(old.nbytes, 1))
+            new = np.ndarray(old.shape, old.dtype, block.buf)
+            new[:] = old
+            setattr(self, name, new)
+
+            if name in self.current:
+                self.current[name].unlink()
+            self.current[name] = block
+            self.blocks.append(block)
+
+        self.layout = tuple(
+            (name, self.current[name].name, getattr(self, name).shape, getattr(self, name).dtype.str)
+            for name in self.shared
+        )
+
+    def reserve(self, capacity: int) -> None:
+        size: int = len(self.radius)
+        super().reserve(capacity)
+        if len(self.radius) != size:
+            self.share()
+
+    def static_grid(self) -> tuple:
+        if self._static_dirty:
+            self.static_version += 1
+
+        return super().static_grid()
+
+    def slab_edges(self, x):
+        inner = np.quantile(x, np.linspace(0, 1, self.slabs + 1)[1:-1])
+        return np.concatenate(([-np.inf], inner, [np.inf]))
+
+    def collide_arrays(self, pos, dynamic) -> None:
+        n: int = len(pos)
+        if self.pool is None or n < self.min_parallel:
+            return super().collide_arrays(pos, dynamic)
+
+        self.static_grid()
+        self.cells = None
+        movable = ~self.is_static[:n]
+        edges = self.slab_edges(pos[movable, 0])
+        reach: float = 2 * float(self.radius[:n][movable].max())
+
+        tasks: list = [(self.layout, n, self.static_version, edges, slab, reach) for slab in range(self.slabs)]
+        tests, contacts, overlap, firsts, seconds = zip(*self.pool.map(solve_slab, tasks))
+
+        self.stats.count('pair_tests', sum(tests))
+        self.stats.count('contacts', sum(contacts))
+        if not sum(contacts):
+            return None
+
+        self.max_penetration = max(self.max_penetration, max(overlap))
+        self.wake_contacts(pos, np.concatenate(firsts), np.concatenate(seconds))
+
+        pos[movable] += self.delta[:n][movable]
+
+
+SNAPSHOT_MAGIC: bytes = b'VRLS'
+SNAPSHOT_VERSION: int = 1
+SNAPSHOT_HEADER: Struct = Struct('<4sHIIIIdddI?ddd')
+
+TRAJECTORY_MAGIC: bytes = b'VRLT'
+TRAJECTORY_HEADER: Struct = Struct('<4sII')
+
+
+def write_array(file, values: array) -> None:
+    if byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(file)
+
+
+def read_array(file, typecode: str, count: int) -> array:
+    values = array(typecode)
+    values.fromfile(file, count)
+    if byteorder == 'big':
+        values.byteswap()
+
+    return values
+
+
+def save_snapshot(solver: Solver, path: str) -> None:
+    objects: list = list(solver.objects.values())
+    links: list = list(solver.links.values())
+    index: dict = {obj_id: i for i, obj_id in enumerate(solver.objects)}
+    colors: dict = {}
+    for obj in objects:
+        colors.setdefault(obj.color, len(colors))
+
+    constraint: Constraint = solver.constraint
+    with open(path, 'wb') as file:
+        file.write(
+            SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                solver.sub_steps, solver.link_iterations, len(objects), len(links),
+                solver.gravity.x, solver.gravity.y,
+                solver.sleep_threshold, solver.sleep_frames,
+                constraint is not None,
+                *((constraint.position.x, constraint.position.y, constraint.radius) if constraint else (0, 0, 0))
+            )
+        )
+
+        write_array(file, array('H', [len(colors)]))
+        for color in colors:
+            encoded: bytes = color.encode()
+            write_array(file, array('H', [len(encoded)]))
+            file.write(encoded)
+
+        write_array(
+            file,
+            array(
+                'd',
+                (
+                    value for obj in objects for value in (
+                        obj.position.x, obj.position.y, obj.position_old.x, obj.position_old.y, obj.radius
+                    )
                 )
             )
         )
+        write_array(file, array('B', (obj.is_static for obj in objects)))
+        write_array(file, array('H', (colors[obj.color] for obj in objects)))
+
+        write_array(file, array('I', (index[solver.handle(obj)] for link in links for obj in link.objects)))
+        write_array(file, array('d', (value for link in links for value in (link.length, link.stiffness))))
+        write_array(file, array('B', (link.is_fixed for link in links)))
+
+
+def load_snapshot(path: str, solver_class: type = Solver, **kwargs) -> Solver:
+    with open(path, 'rb') as file:
+        (
+            magic, version,
+            sub_steps, link_iterations, object_count, link_count,
+            gravity_x, gravity_y,
+            sleep_threshold, sleep_frames,
+            has_constraint, constraint_x, constraint_y, constraint_radius
+        ) = SNAPSHOT_HEADER.unpack(file.read(SNAPSHOT_HEADER.size))
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f'{path} is not a version {SNAPSHOT_VERSION} snapshot')
+
+        colors: list = []
+        for _ in range(read_array(file, 'H', 1)[0]):
+            colors.append(file.read(read_array(file, 'H', 1)[0]).decode())
+
+        bodies = read_array(file, 'd', 5 * object_count)
+        is_static = read_array(file, 'B', object_count)
+        color_index = read_array(file, 'H', object_count)
+
+        ends = read_array(file, 'I', 2 * link_count)
+        params = read_array(file, 'd', 2 * link_count)
+        is_fixed = read_array(file, 'B', link_count)
+
+    solver: Solver = solver_class(
+        sub_steps,
+        Constraint(constraint_radius, Vector([constraint_x, constraint_y])) if has_constraint else None,
+        gravity=Vector([gravity_x, gravity_y]),
+        sleep_threshold=sleep_threshold, sleep_frames=sleep_frames,
+        link_iterations=link_iterations,
+        **kwargs
+    )
+
+    ids: list = []
+    for i in range(object_count):
+        x, y, old_x, old_y, radius = bodies[5 * i:5 * i + 5]
+        obj = VerletObject(Vector([x, y]), radius, bool(is_static[i]), colors[color_index[i]])
+        obj.position_old = Vector([old_x, old_y])
+        ids.append(solver.add_obj(obj))
+
+    solver.add_links(
+        [ids[i] for i in ends[0::2]], [ids[i] for i in ends[1::2]],
+        params[0::2], params[1::2], [bool(fixed) for fixed in is_fixed]
+    )
+
+    return solver
+
+
+class TrajectoryRecorder:
+    def __init__(self, path: str, count: int, chunk: int = 256):
+        if np is None:
+            raise ImportError('TrajectoryRecorder requires numpy')
+
+        self.path: str = path
+        self.count: int = count
+        self.chunk: int = chunk if chunk > 0 else 1
+        self.frames: int = 0
+
+        with open(path, 'wb') as file:
+            file.write(TRAJECTORY_HEADER.pack(TRAJECTORY_MAGIC, count, 0))
+        self.map = None
+        self.grow()
+
+    def grow(self) -> None:
+        capacity: int = (len(self.map) if self.map is not None else 0) + self.chunk
+        if self.map is not None:
+            self.map.flush()
+
+        with open(self.path, 'r+b') as file:
+            file.truncate(TRAJECTORY_HEADER.size + capacity * self.count * 2 * 4)
+        self.map = np.memmap(
+            self.path, dtype='<f4', mode='r+',
+            offset=TRAJECTORY_HEADER.size, shape=(capacity, self.count, 2)
+        )
 
-    def update_position(self, dt: int) -> None:
-        velocity: Vector = self.position - self.position_old
+    def record(self, solver: Solver) -> None:
+        positions = solver.positions()
+        if len(positions) != self.count:
+            raise ValueError(f'trajectory records {self.count} bodies, solver has {len(positions)}')
 
-        self.position_old = self.position.copy()
+        if self.frames == len(self.map):
+            self.grow()
+        self.map[self.frames] = np.reshape(positions, (-1, 2))
+        self.frames += 1
 
-        self.position = self.position + velocity + self.acceleration * dt * dt
+    def close(self) -> None:
+        if self.map is None:
+            return None
 
-        self.acceleration = ZERO_VECTOR.copy()
+        self.map.flush()
+        self.map = None
+        with open(self.path, 'r+b') as file:
+            file.write(TRAJECTORY_HEADER.pack(TRAJECTORY_MAGIC, self.count, self.frames))
+            file.truncate(TRAJECTORY_HEADER.size + self.frames * self.count * 2 * 4)
 
-    def accelerate(self, acc: Vector):
-        self.acceleration += acc
+    def __enter__(self):
+        return self
 
-    def get_coords(self):
-        rel_coords = Vector(
-            [
-                self.radius,
-                self.radius
-            ]
-        )
-        ld = self.position - rel_coords
-        ru = self.position + rel_coords
+    def __exit__(self, *exc_info):
+        self.close()
 
-        return ld.values + ru.values
 
+class Trajectory:
+    def __init__(self, path: str):
+        if np is None:
+            raise ImportError('Trajectory requires numpy')
 
-class Link:
-    def __init__(self, objects: tuple[VerletObject, VerletObject], length: float, is_fixed: bool = True):
-        self.objects: tuple[VerletObject, VerletObject] = objects
-        self.length: float = length
-        self.is_fixed: bool = is_fixed
+        with open(path, 'rb') as file:
+            magic, count, frames = TRAJECTORY_HEADER.unpack(file.read(TRAJECTORY_HEADER.size))
+        if magic != TRAJECTORY_MAGIC:
+            raise ValueError(f'{path} is not a trajectory')
 
-    def update(self):
-        obj1, obj2 = self.objects
+        self.count: int = count
+        self.frames = np.memmap(
+            path, dtype='<f4', mode='r',
+            offset=TRAJECTORY_HEADER.size, shape=(frames, count, 2)
+        ) if frames else np.zeros((0, count, 2), dtype='<f4')
 
-        axis: Vector = obj1.position - obj2.position
-        dist: float = axis.length
+    def __len__(self):
+        return len(self.frames)
 
-        if self.is_fixed or dist > self.length:
-            n: Vector = axis / dist
-            d: float = (self.length - dist) / 100
-            if not obj1.is_static:
-                obj1.position += n * d
-            if not obj2.is_static:
-                obj2.position -= n * d
+    def __getitem__(self, frame):
+        return self.frames[frame]
 
-    def get_coords(self):
-        return [i for obj in self.objects for i in obj.position]
 
+def count_vector_allocations(solver: Solver, steps: int = 10, dt: float = 1 / 60) -> float:
+    count: int = 0
+    init = Vector.__init__
 
-class Constraint:
-    def __init__(self, radius: float, position: Vector):
-        self.radius: float = radius
-        self.position: Vector = position
+    def counting_init(self, values):
+        nonlocal count
+        count += 1
+        init(self, values)
 
-    def apply(self, obj: VerletObject) -> None:
-        to_obj: Vector = obj.position - self.position
-        dist: float = to_obj.length
+    Vector.__init__ = counting_init
+    try:
+        for _ in range(steps):
+            solver.update(dt)
+    finally:
+        Vector.__init__ = init
 
-        if dist > (self.radius - obj.radius):
-            n: Vector = to_obj / dist
-            obj.position = self.position + n * (self.radius - obj.radius)
+    return count / steps
 
-    def get_coords(self):
-        rel_coords: Vector = Vector(
-            [
-                self.radius,
-                self.radius
-            ]
-        )
-        ld = self.position - rel_coords
-        ru = self.position + rel_coords
 
-        return ld.values + ru.values
+def state_checksum(solver: Solver, quantum: float = 0.0, previous: int = 0) -> int:
+    values: array = array('d')
+    objects: dict = solver.objects
 
+    for obj_id in sorted(objects):
+        obj = objects[obj_id]
+        state: tuple = (obj.position.x, obj.position.y, obj.position_old.x, obj.position_old.y)
+        if quantum > 0:
+            state = tuple(round(value / quantum) for value in state)
 
-class Solver:
-    def __init__(
-            self,
-            sub_steps: int = 1,
-            constraint: Constraint = None, canvas: Canvas = None,
-            gravity: Vector = Vector([0, 1000])
-    ):
-        if sub_steps <= 0:
-            sub_steps = 1
-        self.sub_steps: int = sub_steps
+        values.append(obj_id)
+        values.extend(state)
 
-        self.constraint: Constraint = constraint
-        self.canvas: Canvas = canvas
-        self.gravity: Vector = gravity.copy()
+    if byteorder != 'little':
+        values.byteswap()
 
-        self.objects: dict[int: VerletObject] = {}
-        self.links: dict = {}
+    return crc32(values.tobytes(), previous)
 
-    def update(self, dt: float) -> None:
-        dt /= self.sub_steps
 
-        for _ in range(self.sub_steps):
+def divergence(first: Solver, second: Solver) -> tuple:
+    error: float = 0.0
+    body = None
 
-            for id, obj in self.objects.items():
-                if obj.is_static:
-                    continue
+    for obj_id in sorted(first.objects.keys() | second.objects.keys()):
+        if obj_id not in first.objects or obj_id not in second.objects:
+            return float('inf'), obj_id
 
-                obj.accelerate(self.gravity)
-                obj.update_position(dt)
-                if self.constraint is not None:
-                    self.constraint.apply(obj)
+        a, b = first.objects[obj_id].position, second.objects[obj_id].position
+        distance: float = max(abs(a.x - b.x), abs(a.y - b.y))
+        if distance > error:
+            error, body = distance, obj_id
 
-                for obj2 in self.objects.values():
-                    collision_axis: Vector = obj.position - obj2.position
-                    dist: float = collision_axis.length
-                    min_dist = obj.radius + obj2.radius
-                    if dist < min_dist and dist != 0:
-                        n: Vector = collision_axis / dist
-                        d: float = (min_dist - dist) / 2
-                        if not obj.is_static:
-                            obj.position += n * d
-                        if not obj2.is_static:
-                            obj2.position -= n * d
-
-            for L in self.links.values():
-                L.update()
+    return error, body
 
-    def draw(self):
-        for id, obj in self.objects.items():
-            rel_coords: Vector = Vector(
-                [
-                    obj.radius,
-                    obj.radius
-                ]
-            )
-            self.canvas.moveto(id, *obj.position - rel_coords)
 
-        links = self.links.copy()
+class StateHashes:
+    def __init__(self, every: int = 1, quantum: float = 0.0):
+        self.every: int = max(every, 1)
+        self.quantum: float = quantum
 
-        for id in links.keys():
-            self.canvas.delete(id)
-            line = self.links.pop(id)
+        self.step: int = 0
+        self.checksum: int = 0
+        self.hashes: list[tuple[int, int]] = []
 
-            id = self.canvas.create_line(*line.get_coords(), fill='grey')
+    def record(self, solver: Solver) -> None:
+        self.step += 1
+        if self.step % self.every == 0:
+            self.checksum = state_checksum(solver, self.quantum, self.checksum)
+            self.hashes.append((self.step, self.checksum))
 
-            self.links[id] = line
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as file:
+            dump({'every': self.every, 'quantum': self.quantum, 'hashes': self.hashes}, file, indent=2)
 
-    def add_obj(self, obj: VerletObject):
-        id = self.canvas.create_oval(
-            *obj.get_coords(),
-            fill=obj.color
+
+class Telemetry:
+    columns: tuple = (
+        'frame', 'time', 'frame_ms', 'sub_step_ms', 'bodies', 'contacts', 'kinetic_energy', 'constraint_error'
+    )
+    batch: int = 64
+
+    def __init__(self, capacity: int = 3600, target: str = None, interval: float = 1.0):
+        self.capacity: int = max(capacity, 1)
+        self.samples: array = array('d', bytes(8 * self.capacity * len(self.columns)))
+        self.total: int = 0
+
+        self.target: str = target
+        self.interval: float = interval
+        self.exported: int = 0
+        self.dropped: int = 0
+        self.deadline: float = None
+        self.channel = None
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def record(self, solver: Solver, dt: float, elapsed: float) -> None:
+        stats: SolverStats = solver.stats
+        last: dict = stats.last
+        sub_steps: int = max(last['sub_steps'], 1)
+        physics: float = sum(last[phase] for phase in stats.phases if phase != 'draw')
+
+        width: int = len(self.columns)
+        offset: int = self.total % self.capacity * width
+        self.samples[offset:offset + width] = array(
+            'd',
+            (
+                self.total, time(), 1000 * elapsed, 1000 * physics / sub_steps, len(solver.objects), last['contacts'],
+                solver.kinetic_energy(dt / sub_steps), solver.constraint_error()
+            )
         )
-        self.objects[id] = obj
+        self.total += 1
+
+        if self.target is not None:
+            now: float = perf_counter()
+            if self.deadline is None:
+                self.deadline = now + self.interval
+            elif now >= self.deadline:
+                self.export()
+                self.deadline = now + self.interval
+
+    def since(self, frame: int) -> tuple[int, list]:
+        width: int = len(self.columns)
+        rows: list = []
+        for sequence in range(max(frame, self.total - len(self)), self.total):
+            offset: int = sequence % self.capacity * width
+            rows.append(tuple(self.samples[offset:offset + width]))
+
+        return self.total, rows
+
+    def rows(self, count: int = None) -> list:
+        return self.since(self.total - min(len(self) if count is None else count, len(self)))[1]
+
+    def latest(self) -> dict:
+        return dict(zip(self.columns, self.rows(1)[0])) if self.total else {}
+
+    def export(self) -> None:
+        start: int = max(self.exported, self.total - len(self))
+        self.dropped += start - self.exported
+        self.exported, rows = self.since(start)
+        if not rows:
+            return None
 
-    def remove_obj(self, id):
-        if id in self.objects:
-            del self.objects[id]
-            self.canvas.delete(id)
+        lines: list = [dumps(dict(zip(self.columns, row))) + '\n' for row in rows]
+        if not self.target.startswith('unix:'):
+            with open(self.target, 'a') as file:
+                file.writelines(lines)
+            return None
 
-    def add_link(self, link: Link):
-        id = self.canvas.create_line(
-            *link.get_coords(),
-            fill='grey'
+        if self.channel is None:
+            self.channel = socket(AF_UNIX, SOCK_DGRAM)
+            self.channel.setblocking(False)
+        for i in range(0, len(lines), self.batch):
+            try:
+                self.channel.sendto(''.join(lines[i:i + self.batch]).encode(), self.target[5:])
+            except OSError:
+                self.dropped += len(lines[i:i + self.batch])
+
+    def close(self) -> None:
+        if self.target is not None:
+            self.export()
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+
+
+class SharedFrames:
+    def __init__(self, capacity: int, link_capacity: int, name: str = None):
+        self.capacity: int = capacity
+        self.link_capacity: int = link_capacity
+
+        names: tuple = SolverStats.phases + SolverStats.counters
+        buffer_size: int = 2 + 6 * capacity + 3 * link_capacity
+        size: int = 4 + len(names) + 2 * buffer_size
+
+        self.block: SharedMemory = SharedMemory(name, create=name is None, size=8 * size)
+        self.name: str = self.block.name
+        data = np.ndarray(size, float, self.block.buf)
+
+        self.control = data[:4]
+        self.stats = data[4:4 + len(names)]
+
+        self.buffers: list = []
+        offset: int = 4 + len(names)
+        for _ in range(2):
+            meta = data[offset:offset + 2]
+            objects = data[offset + 2:offset + 2 + 6 * capacity].reshape(capacity, 6)
+            links = data[offset + 2 + 6 * capacity:offset + buffer_size].reshape(link_capacity, 3)
+            self.buffers.append((meta, objects, links))
+            offset += buffer_size
+
+    @property
+    def frame(self) -> int:
+        return int(self.control[3])
+
+    def fits(self, rows, links) -> bool:
+        return len(rows) <= self.capacity and len(links) <= self.link_capacity
+
+    def publish(self, rows, links, stats: SolverStats) -> None:
+        control = self.control
+        target: int = 1 - int(control[2])
+        meta, objects, link_rows = self.buffers[target]
+
+        control[target] += 1
+        meta[:] = len(rows), len(links)
+        objects[:len(rows)] = rows
+        link_rows[:len(links)] = links
+        control[target] += 1
+
+        control[2] = target
+        control[3] += 1
+        self.stats[:] = [stats.last[name] for name in SolverStats.phases + SolverStats.counters]
+
+    def read(self):
+        control = self.control
+        for _ in range(3):
+            latest: int = int(control[2])
+            sequence: float = control[latest]
+            if sequence % 2:
+                continue
+
+            meta, objects, links = self.buffers[latest]
+            n, m = int(meta[0]), int(meta[1])
+            frame: tuple = (objects[:n].copy(), links[:m].copy(), self.stats.copy())
+            if control[latest] == sequence:
+                return frame
+
+        return None
+
+
+def apply_command(solver: Solver, name: str, args: tuple) -> None:
+    if name == 'add_obj':
+        solver.add_obj(*args)
+    elif name == 'add_link':
+        first, second, length, is_fixed, stiffness = args
+        if first in solver.objects and second in solver.objects:
+            solver.add_link(Link((solver.objects[first], solver.objects[second]), length, is_fixed, stiffness))
+    elif name in ('remove_obj', 'set_static', 'move_obj') and args[0] in solver.objects:
+        getattr(solver, name)(*args)
+
+
+def run_solver(solver: Solver, commands, events, capacity: int, link_capacity: int, max_steps: int = 5) -> None:
+    frames: SharedFrames = SharedFrames(capacity, link_capacity)
+    blocks: list = [frames]
+    events.put((frames.name, frames.capacity, frames.link_capacity))
+
+    try:
+        while True:
+            batch: list = [commands.get()]
+            try:
+                while True:
+                    batch.append(commands.get_nowait())
+            except Empty:
+                pass
+
+            steps: int = 0
+            for name, args in batch:
+                if name == 'close':
+                    return None
+                if name == 'update':
+                    if max_steps is None or steps < max_steps:
+                        solver.update(*args)
+                        steps += 1
+                else:
+                    apply_command(solver, name, args)
+
+            rows, links = solver.state_rows(), solver.link_rows()
+            if not frames.fits(rows, links):
+                frames = SharedFrames(2 * max(len(rows), frames.capacity), 2 * max(len(links), frames.link_capacity))
+                blocks.append(frames)
+                events.put((frames.name, frames.capacity, frames.link_capacity))
+            frames.publish(rows, links, solver.stats)
+    finally:
+        for frames in blocks:
+            frames.block.unlink()
+
+
+class SolverProcess:
+    def __init__(self, solver: Solver, capacity: int = 4096, max_steps: int = 5):
+        if np is None:
+            raise ImportError('SolverProcess requires numpy')
+
+        self.constraint: Constraint = solver.constraint
+        self.stats: SolverStats = SolverStats()
+
+        self.objects: dict[int, VerletObject] = {}
+        self.links: dict[int, Link] = {}
+        self.handles: dict[int, int] = {}
+        self.observers: list = []
+
+        self.rows = np.zeros((0, 6))
+        self.link_array = np.zeros((0, 3))
+        self.cells: tuple = None
+        self.frame: int = 0
+
+        self.commands = Queue()
+        self.events = Queue()
+        resource_tracker.ensure_running()
+        self.process: Process = Process(
+            target=run_solver,
+            args=(
+                solver, self.commands, self.events,
+                max(capacity, 2 * len(solver.objects)), max(capacity, 2 * len(solver.links)), max_steps
+            ),
+            daemon=True
         )
+        self.process.start()
+
+        self.frames: SharedFrames = None
+        self.retired: list[SharedFrames] = []
+        self.attach_frames(self.events.get())
+
+    def attach_frames(self, message: tuple) -> None:
+        if self.frames is not None:
+            self.retired.append(self.frames)
 
-        for i in link.objects:
-            if i not in self.objects.values():
-                self.add_obj(i)
+        name, capacity, link_capacity = message
+        self.frames = SharedFrames(capacity, link_capacity, name)
 
-        self.links[id] = link
+    def close(self) -> None:
+        self.commands.put(('close', ()))
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+
+    def update(self, dt: float) -> None:
+        self.commands.put(('update', (dt,)))
+
+    def add_obj(self, obj: VerletObject) -> None:
+        self.commands.put(('add_obj', (obj,)))
+
+    def remove_obj(self, obj_id) -> None:
+        if obj_id in self.objects:
+            self.commands.put(('remove_obj', (obj_id,)))
+
+    def set_static(self, obj_id, is_static: bool) -> None:
+        self.objects[obj_id].is_static = is_static
+        self.commands.put(('set_static', (obj_id, is_static)))
+
+    def move_obj(self, obj_id, position: Vector) -> None:
+        obj = self.objects[obj_id]
+        obj.position.set(position.x, position.y)
+        for observer in self.observers:
+            observer.on_move_obj(obj_id, obj)
+        self.commands.put(('move_obj', (obj_id, position.copy())))
+
+    def handle(self, obj):
+        return self.handles.get(id(obj))
+
+    def add_link(self, link: Link) -> None:
+        first, second = (self.handles[id(obj)] for obj in link.objects)
+        self.commands.put(('add_link', (first, second, link.length, link.is_fixed, link.stiffness)))
+
+    def pick(self, position: Vector, radius: float = 0):
+        rows = self.rows
+        if not len(rows):
+            return None
+
+        if self.cells is None:
+            cell_size, keys, order = grid_index(rows[:, 1:3], rows[:, 3], np.arange(len(rows)))
+            self.cells = (cell_size, order, keys[order])
+        candidates = cell_query(self.cells, tuple(position), radius)
+        if not len(candidates):
+            return None
+
+        distance = np.hypot(rows[candidates, 1] - position.x, rows[candidates, 2] - position.y) - rows[candidates, 3]
+        i: int = int(distance.argmin())
+
+        return int(rows[candidates[i], 0]) if distance[i] <= radius else None
+
+    def state_rows(self):
+        return self.rows
+
+    def link_rows(self):
+        return self.link_array
+
+    def kinetic_energy(self, dt: float) -> float:
+        return float('nan')
+
+    def constraint_error(self) -> float:
+        return float('nan')
+
+    def attach(self, observer) -> None:
+        self.observers.append(observer)
+
+        for id, obj in self.objects.items():
+            observer.on_add_obj(id, obj)
+        for id, link in self.links.items():
+            observer.on_add_link(id, link)
+
+    def detach(self, observer) -> None:
+        self.observers.remove(observer)
+
+    def sync(self) -> None:
+        try:
+            while True:
+                self.attach_frames(self.events.get_nowait())
+        except Empty:
+            pass
+
+        frame: int = self.frames.frame
+        if frame == self.frame:
+            return None
+        state = self.frames.read()
+        if state is None:
+            return None
+        self.frame = frame
+
+        rows, links, stats = state
+        self.rows = rows
+        self.cells = None
+        self.link_array = links
+        objects: dict = self.objects
+
+        added: list = []
+        seen: set = set()
+        for obj_id, x, y, radius, is_static, sleeping in rows.tolist():
+            obj_id = int(obj_id)
+            seen.add(obj_id)
+
+            obj = objects.get(obj_id)
+            if obj is None:
+                obj = VerletObject(Vector([x, y]), radius, bool(is_static))
+                objects[obj_id] = obj
+                self.handles[id(obj)] = obj_id
+                added.append(obj_id)
+            else:
+                obj.position.set(x, y)
+                obj.radius = radius
+                obj.is_static = bool(is_static)
+            obj.sleeping = bool(sleeping)
+
+        added_links: list = []
+        seen_links: set = set()
+        for link_id, first, second in links.astype(np.int64).tolist():
+            seen_links.add(link_id)
+            if link_id not in self.links:
+                self.links[link_id] = Link((objects[first], objects[second]), 0)
+                added_links.append(link_id)
+
+        for link_id in self.links.keys() - seen_links:
+            del self.links[link_id]
+            for observer in self.observers:
+                observer.on_remove_link(link_id)
+        for obj_id in objects.keys() - seen:
+            del self.handles[id(objects.pop(obj_id))]
+            for observer in self.observers:
+                observer.on_remove_obj(obj_id)
+        for observer in self.observers:
+            for obj_id in added:
+                observer.on_add_obj(obj_id, objects[obj_id])
+            for link_id in added_links:
+                observer.on_add_link(link_id, self.links[link_id])
+
+        last: dict = self.stats.last
+        for name, value in zip(SolverStats.phases + SolverStats.counters, stats.tolist()):
+            if name in SolverStats.counters:
+                last[name] = int(value)
+            elif name != 'draw':
+                last[name] = value
+
+    def draw(self) -> None:
+        start: float = perf_counter()
+        self.sync()
+        for observer in self.observers:
+            observer.draw(self)
+        self.stats.record_draw(start)
+
+
+class FrameScheduler:
+    def __init__(self, rate: int = 60, max_steps: int = 5, frame_rate: int = None):
+        if rate <= 0:
+            rate = 1
+        self.step: float = 1 / rate
+        self.max_steps: int = max_steps
+        self.frame_step: float = 1 / frame_rate if frame_rate else None
+
+        self.accumulator: float = 0.0
+        self.last: float = None
+
+    def advance(self, now: float) -> int:
+        if self.frame_step is not None:
+            now = 0.0 if self.last is None else self.last + self.frame_step
+
+        if self.last is None:
+            self.last = now
+            return 0
+
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps: int = int(self.accumulator / self.step + 1e-9)
+        if self.max_steps is not None and steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+
+        return steps
 
 
 class Root:
-    def __init__(self, solver: Solver = Solver(), fps: int = 30, *args, **kwargs):
+    def __init__(
+            self, solver: Solver = Solver(), fps: int = 30, *args,
+            physics_fps: int = 60, show_stats: bool = True, deterministic: bool = False,
+            raster_threshold: int = 2000, telemetry: Telemetry = None, **kwargs
+    ):
         if fps <= 0:
             fps = 1
         self.fps: int = fps
+        self.telemetry: Telemetry = telemetry if telemetry is not None else Telemetry()
+
+        self.scheduler: FrameScheduler = (
+            FrameScheduler(physics_fps, None, fps) if deterministic else FrameScheduler(physics_fps)
+        )
+        self.frame: int = 0
+        self.last_frame: float = None
 
         self.solver = solver
         self.root = Tk(*args, **kwargs)
@@ -309,19 +3182,33 @@ class Root:
 
         canvas = Canvas(self.root)
         canvas.grid(row=0, column=0, sticky='nesw')
-        self.solver.canvas = canvas
+        self.canvas: Canvas = canvas
 
-        self.fps_counter = self.solver.canvas.create_text(
+        self.fps_counter = self.canvas.create_text(
             15,
             10,
             text=f'{fps}',
             justify='left'
         )
+        self.stats_overlay = self.canvas.create_text(
+            5,
+            20,
+            text='',
+            anchor='nw',
+            font=('TkFixedFont', 8),
+            state='normal' if show_stats else 'hidden'
+        )
 
         if self.solver.constraint is not None:
             canvas.create_oval(*self.solver.constraint.get_coords(), fill='black')
 
+        self.raster_threshold: int = raster_threshold
+        self.renderer = None
+        self.renderer = self.renderer_class()(canvas)
+        self.solver.attach(self.renderer)
+
         self.menu_opened: bool = False
+        self.pick_radius: float = 25
 
         # Bindings
         canvas.bind(
@@ -337,12 +3224,12 @@ class Root:
                     self.obj_size.get(),
                     self.obj_is_static.get()
                 )
-            ) if not self.menu_opened else self.close_menu(self.solver.canvas.find_closest(e.x, e.y)[0])
+            ) if not self.menu_opened else self.close_menu(self.pick(e))
         )
         canvas.bind(
             '<ButtonRelease-2>',
             lambda e: self.solver.remove_obj(
-                e.widget.find_closest(e.x, e.y)[0]
+                self.pick(e)
             )
         )
 
@@ -398,12 +3285,11 @@ class Root:
     def summon_object_menu(self, event):
         self.menu_opened = True
         solver: Solver = self.solver
-        canvas: Canvas = self.solver.canvas
 
-        obj_id: int = canvas.find_closest(event.x, event.y)[0]
+        obj_id: int = self.pick(event)
         if obj_id not in solver.objects:
             return None
-        canvas.itemconfig(obj_id, outline='red')
+        self.renderer.outline(obj_id, 'red')
 
         m: Menu = Menu(tearoff=False)
         m.add_command(label="Remove", command=lambda: self.remove(obj_id), accelerator=f'{obj_id}')
@@ -420,8 +3306,7 @@ class Root:
         self.close_menu(obj_id)
 
     def change_state(self, obj_id: int):
-        obj = self.solver.objects[obj_id]
-        obj.is_static = not obj.is_static
+        self.solver.set_static(obj_id, not self.solver.objects[obj_id].is_static)
 
         self.close_menu(obj_id)
 
@@ -443,49 +3328,697 @@ class Root:
             self.linked_obj_id = None
 
     def close_menu(self, obj_id: int):
-        self.solver.canvas.itemconfig(obj_id, outline='black')
+        self.renderer.outline(obj_id, 'black')
         self.menu_opened = False
 
     def drag_obj(self, event):
         solver: Solver = self.solver
-        canvas: Canvas = self.solver.canvas
 
-        obj_id = canvas.find_closest(event.x, event.y)[0]
+        obj_id = self.pick(event)
         if obj_id not in solver.objects:
             return None
 
         obj = solver.objects[obj_id]
-        obj.is_static = True
-        obj.position = Vector(
-            [event.x, event.y]
+        if not obj.is_static:
+            solver.set_static(obj_id, True)
+        solver.move_obj(
+            obj_id,
+            Vector(
+                [event.x, event.y]
+            )
         )
 
+    def pick(self, event):
+        return self.solver.pick(Vector([event.x, event.y]), self.pick_radius)
+
+    def renderer_class(self) -> type:
+        current: type = CanvasRenderer if self.renderer is None else type(self.renderer)
+        if np is None or self.raster_threshold is None:
+            return current
+
+        count: int = len(self.solver.objects)
+        if count >= self.raster_threshold:
+            return RasterRenderer
+        if count < self.raster_threshold * 3 // 4:
+            return CanvasRenderer
+
+        return current
+
+    def choose_renderer(self) -> None:
+        renderer_class: type = self.renderer_class()
+        if isinstance(self.renderer, renderer_class):
+            return None
+
+        renderer = renderer_class(self.canvas)
+        self.solver.detach(self.renderer)
+        self.renderer.clear()
+        self.renderer = renderer
+        self.solver.attach(renderer)
+
+        self.canvas.tag_raise(self.fps_counter)
+        self.canvas.tag_raise(self.stats_overlay)
+
     def mainloop(self):
-        i = 0
-        while True:
-            start = time()
+        self.root.after(0, self.tick)
+        self.root.mainloop()
+
+    def tick(self):
+        start = perf_counter()
+
+        for _ in range(self.scheduler.advance(start)):
+            self.solver.update(self.scheduler.step)
+
+        self.choose_renderer()
+        self.solver.draw()
+        self.telemetry.record(self.solver, self.scheduler.step, perf_counter() - start)
+
+        if self.frame % 10 == 0 and self.last_frame is not None and start != self.last_frame:
+            self.canvas.itemconfig(self.fps_counter, text=f'{round(1 / (start - self.last_frame), 1)}')
+            self.canvas.itemconfig(self.stats_overlay, text=self.solver.stats.summary())
+            self.canvas.tag_raise(self.stats_overlay)
+        self.frame += 1
+        self.last_frame = start
+
+        delay: float = 1 / self.fps - (perf_counter() - start)
+        self.root.after(max(int(delay * 1000), 1), self.tick)
+
 
-            t = Thread(target=sleep, args=(1 / self.fps,))
-            t.start()
+def grid_points(origin: Vector, columns: int, rows: int, spacing: float):
+    for row in range(rows):
+        for column in range(columns):
+            yield origin.x + column * spacing, origin.y + row * spacing
 
-            self.root.update()
-            self.root.update_idletasks()
 
-            self.solver.draw()
+def disc_points(center: Vector, radius: float, count: int, seed: int = 0):
+    rng: Random = Random(seed)
 
-            t.join()
+    for _ in range(count):
+        r: float = radius * rng.random() ** 0.5
+        angle: float = 2 * pi * rng.random()
+        yield center.x + r * cos(angle), center.y + r * sin(angle)
 
-            end = time()
 
-            if i % 10 == 0 and (end - start) != 0:
-                self.solver.canvas.itemconfig(self.fps_counter, text=f'{round(1 / (end - start), 1)}')
-            i += 1
+def stream_points(origin: Vector, direction: Vector, count: int, spacing: float):
+    length: float = direction.length or 1
+    dx: float = direction.x / length * spacing
+    dy: float = direction.y / length * spacing
 
-            self.solver.update(1 / self.fps)
+    for i in range(count):
+        yield origin.x + i * dx, origin.y + i * dy
 
 
-con = Constraint(325, Vector([375, 335]))
-solver = Solver(8, con)
-root = Root(solver, 60)
+def random_scene(solver: Solver, count: int, radius: float = 5, seed: int = 0) -> Solver:
+    rng: Random = Random(seed)
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+    spread: float = constraint.radius - radius if constraint is not None else 300
 
-root.mainloop()
+    solver.spawn(
+        (
+            (
+                center.x + rng.uniform(-spread, spread) / 2 ** 0.5,
+                center.y + rng.uniform(-spread, spread) / 2 ** 0.5
+            )
+            for _ in range(count)
+        ),
+        radius
+    )
+
+    return solver
+
+
+def run_headless(solver: Solver, steps: int, fps: int = 60, on_frame=None, telemetry: Telemetry = None) -> float:
+    start = perf_counter()
+    for _ in range(steps):
+        began: float = perf_counter()
+        solver.update(1 / fps)
+        if telemetry is not None:
+            telemetry.record(solver, 1 / fps, perf_counter() - began)
+        if on_frame is not None:
+            on_frame(solver)
+
+    return steps / (perf_counter() - start)
+
+
+def rope(
+        solver: Solver, points, radius: float = 2, stiffness: float = 0.01, pinned: bool = True,
+        color: str = 'white'
+) -> list:
+    points = list(points)
+    ids: list = solver.spawn(points[:1], radius, pinned, color) + solver.spawn(points[1:], radius, False, color)
+    solver.add_links(ids[:-1], ids[1:], None, stiffness)
+
+    return ids
+
+
+def cloth(
+        solver: Solver, origin: Vector, columns: int, rows: int, spacing: float, radius: float = 2,
+        stiffness: float = 0.01, pinned: bool = True, color: str = 'white'
+) -> list:
+    ids: list = solver.spawn(grid_points(origin, columns, 1, spacing), radius, pinned, color)
+    ids += solver.spawn(grid_points(Vector([origin.x, origin.y + spacing]), columns, rows - 1, spacing), radius, False, color)
+
+    across: list = [row * columns + column for row in range(rows) for column in range(columns - 1)]
+    down: range = range(columns * (rows - 1))
+    solver.add_links(
+        [ids[i] for i in across] + [ids[i] for i in down],
+        [ids[i + 1] for i in across] + [ids[i + columns] for i in down],
+        spacing, stiffness
+    )
+
+    return ids
+
+
+def soft_ring(
+        solver: Solver, center: Vector, radius: float, count: int, body_radius: float = 2,
+        stiffness: float = 0.01, hub: bool = True, color: str = 'white'
+) -> list:
+    ids: list = solver.spawn(
+        (
+            (center.x + radius * cos(2 * pi * i / count), center.y + radius * sin(2 * pi * i / count))
+            for i in range(count)
+        ),
+        body_radius, False, color
+    )
+    first: list = ids + ids
+    second: list = ids[1:] + ids[:1] + ids[2:] + ids[:2]
+
+    if hub:
+        ids += solver.spawn([(center.x, center.y)], body_radius, False, color)
+        first += ids[-1:] * count
+        second += ids[:-1]
+    solver.add_links(first, second, None, stiffness)
+
+    return ids
+
+
+def rope_scene(solver: Solver, length: int, radius: float = 2) -> Solver:
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+    half: float = (constraint.radius if constraint is not None else 325) / 2
+    spacing: float = 2 * radius + 1
+    columns: int = max(int(2 * half / spacing), 1)
+
+    points: list = []
+    for i in range(length + 1):
+        row, column = divmod(i, columns)
+        if row % 2:
+            column = columns - 1 - column
+        points.append((center.x - half + column * spacing, center.y - half + row * spacing))
+    rope(solver, points, radius)
+
+    return solver
+
+
+def cloth_scene(solver: Solver, width: int, height: int, radius: float = 2) -> Solver:
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+    spacing: float = 2 * radius + 2
+    left: float = center.x - (width - 1) * spacing / 2
+    top: float = center.y - (height - 1) * spacing / 2
+
+    cloth(solver, Vector([left, top]), width, height, spacing, radius)
+
+    return solver
+
+
+def ring_scene(solver: Solver, count: int, size: float = 24, radius: float = 2) -> Solver:
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+    half: float = (constraint.radius if constraint is not None else 325) / 2 ** 0.5 - size
+    columns: int = max(int(2 * half / (2 * size + 4)) + 1, 1)
+    spacing: float = 2 * half / max(columns - 1, 1)
+
+    for i in range(count):
+        row, column = divmod(i, columns)
+        ring: Vector = Vector([center.x - half + column * spacing, center.y - half + row * spacing])
+        soft_ring(solver, ring, size, max(int(2 * pi * size / (2 * radius + 1)), 3), radius)
+
+    return solver
+
+
+def arena_scene(solver: Solver, count: int, dynamic: float = 0.1, radius: float = 3, seed: int = 0) -> Solver:
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+    half: float = (constraint.radius if constraint is not None else 325) / 2 ** 0.5 - radius
+    static: int = count - int(count * dynamic)
+    columns: int = max(int(static ** 0.5), 1)
+    spacing: float = 2 * half / columns
+
+    solver.spawn(
+        (
+            (
+                center.x - half + (i % columns + i // columns % 2 / 2) * spacing,
+                center.y - half / 2 + i // columns * spacing
+            )
+            for i in range(static)
+        ),
+        radius,
+        True,
+        'grey'
+    )
+
+    rng: Random = Random(seed)
+    solver.spawn(
+        (
+            (center.x + rng.uniform(-half, half), center.y - half + rng.uniform(0, half / 2))
+            for _ in range(count - static)
+        ),
+        radius
+    )
+
+    return solver
+
+
+def field_scene(solver: Solver, count: int, radius: float = 5, seed: int = 0) -> Solver:
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+    extent: float = constraint.radius if constraint is not None else 325
+
+    solver.forces += [
+        UniformField(Vector([150, 0])),
+        PointField(center, 5e6, extent / 2),
+        DragField(0.5),
+        vortex_field(center, extent, 200),
+    ]
+
+    return random_scene(solver, count, radius, seed)
+
+
+SOLVERS: dict = {
+    'python': Solver,
+    'numpy': ArraySolver,
+    'parallel': ParallelSolver,
+}
+
+BENCHMARKS: dict = {
+    'pile-100': (random_scene, {'count': 100}),
+    'pile-1k': (random_scene, {'count': 1000}),
+    'pile-5k': (random_scene, {'count': 5000}),
+    'rope-1k': (rope_scene, {'length': 1000}),
+    'cloth-40x40': (cloth_scene, {'width': 40, 'height': 40}),
+    'cloth-100x100': (cloth_scene, {'width': 100, 'height': 100, 'radius': 1}),
+    'rings-25': (ring_scene, {'count': 25}),
+    'arena-2k': (arena_scene, {'count': 2000}),
+    'fields-1k': (field_scene, {'count': 1000}),
+}
+
+
+def make_solver(backend: str = 'python', sub_steps: int = 8, **kwargs) -> Solver:
+    return SOLVERS[backend](sub_steps, Constraint(325, Vector([375, 335])), **kwargs)
+
+
+def backend_options(backend: str, dtype: str = 'float64', **parallel) -> dict:
+    if backend == 'python':
+        return {}
+
+    options: dict = {'dtype': np.dtype(dtype)}
+    if backend == 'parallel':
+        options.update(parallel)
+
+    return options
+
+
+def benchmark(
+        name: str, backend: str = 'python', steps: int = 30, sub_steps: int = 8, fps: int = 60, **options
+) -> dict:
+    build, params = BENCHMARKS[name]
+
+    solver: Solver = build(make_solver(backend, sub_steps, **options), **params)
+    try:
+        solver.update(1 / fps)
+
+        start = perf_counter()
+        for _ in range(steps):
+            solver.update(1 / fps)
+        elapsed: float = perf_counter() - start
+        stats: dict = solver.stats.as_dict()
+
+        allocations: float = count_vector_allocations(solver, 1, 1 / fps)
+    finally:
+        if isinstance(solver, ParallelSolver):
+            solver.close()
+
+    trace_start()
+    try:
+        solver = build(make_solver(backend, sub_steps, **options), **params)
+        resident: int = get_traced_memory()[0]
+        solver.update(1 / fps)
+        peak: int = get_traced_memory()[1]
+    finally:
+        trace_stop()
+        if isinstance(solver, ParallelSolver):
+            solver.close()
+
+    return {
+        'scene': name,
+        'backend': backend,
+        'bodies': len(solver.objects),
+        'links': len(solver.links),
+        'steps': steps,
+        'sub_steps': sub_steps,
+        'steps_per_sec': steps / elapsed,
+        'sub_step_ms': 1000 * elapsed / (steps * solver.sub_steps),
+        'peak_memory_bytes': peak,
+        'bytes_per_body': resident / max(len(solver.objects), 1),
+        'vector_allocations_per_step': allocations,
+        'stats': stats,
+    }
+
+
+def compare_engines(
+        scene: str, first: str = 'python', second: str = 'numpy', steps: int = 300, every: int = 1,
+        tolerance: float = 1e-6, sub_steps: int = 8, fps: int = 60, dtype: str = 'float64', **options
+) -> dict:
+    build, params = BENCHMARKS[scene]
+    engines: list = [
+        build(make_solver(backend, sub_steps, **backend_options(backend, dtype, **options)), **params)
+        for backend in (first, second)
+    ]
+
+    try:
+        for step in range(1, steps + 1):
+            for solver in engines:
+                solver.update(1 / fps)
+            if step % every:
+                continue
+
+            if state_checksum(engines[0]) == state_checksum(engines[1]):
+                continue
+
+            error, body = divergence(*engines)
+            if error > tolerance:
+                return {'scene': scene, 'first': first, 'second': second, 'step': step, 'body': body, 'error': error}
+    finally:
+        for solver in engines:
+            if isinstance(solver, ParallelSolver):
+                solver.close()
+
+    return None
+
+
+def run_benchmarks(
+        names=None, backend: str = 'python', steps: int = 30, sub_steps: int = 8, output: str = None, **options
+) -> list:
+    results: list = []
+
+    for name in names or BENCHMARKS:
+        result = benchmark(name, backend, steps, sub_steps, **options)
+        results.append(result)
+        print(
+            '{scene:<12} {backend:<7} {bodies:>6} bodies {links:>6} links '
+            '{steps_per_sec:>9.2f} steps/s {sub_step_ms:>9.3f} ms/sub-step '
+            '{peak_memory_bytes:>11} B peak {bytes_per_body:>8.1f} B/body'.format(**result)
+        )
+
+    if output is not None:
+        with open(output, 'w') as file:
+            dump(
+                {
+                    'python': python_version(),
+                    'time': time(),
+                    'results': results,
+                },
+                file,
+                indent=2
+            )
+
+    return results
+
+
+SWEEP_DEFAULTS: dict = {
+    'scene': 'pile-100',
+    'backend': 'python',
+    'gravity': 1000.0,
+    'sub_steps': 8,
+    'constraint_radius': 325.0,
+    'stiffness': None,
+    'steps': 600,
+    'fps': 60,
+    'settle_speed': 5.0,
+    'dtype': 'float64',
+}
+
+
+def sweep_grid(**values) -> list:
+    keys: tuple = tuple(values)
+    return [dict(zip(keys, combination)) for combination in product(*values.values())]
+
+
+def parse_grid(items: list) -> dict:
+    values: dict = {}
+    for item in items:
+        key, _, options = item.partition('=')
+        if key not in SWEEP_DEFAULTS or not options:
+            raise ValueError(f'expected KEY=V1,V2,... with KEY in {", ".join(SWEEP_DEFAULTS)}, got {item!r}')
+
+        default = SWEEP_DEFAULTS[key]
+        kind: type = float if default is None else type(default)
+        values[key] = [kind(option) for option in options.split(',')]
+
+        choices = {'scene': BENCHMARKS, 'backend': SOLVERS, 'dtype': ('float64', 'float32')}.get(key)
+        unknown: list = [option for option in values[key] if choices is not None and option not in choices]
+        if unknown:
+            raise ValueError(f'unknown {key} {", ".join(unknown)}, expected one of {", ".join(choices)}')
+
+    return values
+
+
+def parse_field(spec: str, solver: Solver):
+    kind, _, options = spec.partition(':')
+    values: list = [float(option) for option in options.split(',')] if options else []
+    constraint: Constraint = solver.constraint
+    center: Vector = constraint.position if constraint is not None else Vector([375, 335])
+
+    if kind == 'uniform' and len(values) == 2:
+        return UniformField(Vector(values))
+    if kind in ('attractor', 'repulsor') and len(values) in (3, 4):
+        x, y, strength, *reach = values
+        return PointField(Vector([x, y]), strength if kind == 'attractor' else -strength, *reach)
+    if kind == 'drag' and len(values) == 1:
+        return DragField(*values)
+    if kind == 'vortex' and 1 <= len(values) <= 3:
+        return vortex_field(center, constraint.radius if constraint is not None else 325, *values)
+
+    raise ValueError(
+        f'expected uniform:AX,AY, attractor:X,Y,STRENGTH[,RADIUS], repulsor:X,Y,STRENGTH[,RADIUS], '
+        f'drag:K or vortex:SPEED[,CELL[,K]], got {spec!r}'
+    )
+
+
+def run_case(case: dict) -> dict:
+    case = {**SWEEP_DEFAULTS, **case}
+    if case['backend'] == 'python':
+        case['dtype'] = 'float64'
+    dt: float = 1 / case['fps']
+
+    solver: Solver = SOLVERS[case['backend']](
+        case['sub_steps'], Constraint(case['constraint_radius'], Vector([375, 335])), gravity=Vector([0, case['gravity']]),
+        **backend_options(case['backend'], case['dtype'])
+    )
+    build, params = BENCHMARKS[case['scene']]
+    build(solver, **params)
+    if case['stiffness'] is not None:
+        for link in solver.links.values():
+            link.stiffness = case['stiffness']
+        solver.invalidate()
+
+    initial: float = solver.kinetic_energy(dt / solver.sub_steps) + solver.potential_energy()
+    dynamic: int = max(sum(not obj.is_static for obj in solver.objects.values()), 1)
+    settled: int = None
+    elapsed: float = 0.0
+
+    for step in range(1, case['steps'] + 1):
+        start = perf_counter()
+        solver.update(dt)
+        elapsed += perf_counter() - start
+
+        speed: float = (2 * solver.kinetic_energy(dt / solver.sub_steps) / dynamic) ** 0.5
+        if speed >= case['settle_speed']:
+            settled = None
+        elif settled is None:
+            settled = step
+
+    kinetic: float = solver.kinetic_energy(dt / solver.sub_steps)
+    total: float = kinetic + solver.potential_energy()
+
+    return {
+        **case,
+        'bodies': len(solver.objects),
+        'links': len(solver.links),
+        'steps_per_sec': case['steps'] / elapsed if elapsed else 0.0,
+        'kinetic_energy': kinetic,
+        'total_energy': total,
+        'energy_drift': total - initial,
+        'settle_time': settled * dt if settled is not None else None,
+    }
+
+
+def run_sweep(cases: list, path: str, workers: int = None) -> list:
+    results: list = []
+
+    with Pool(workers) as pool, open(path, 'w') as file:
+        for result in pool.imap_unordered(run_case, cases):
+            file.write(dumps(result) + '\n')
+            file.flush()
+            results.append(result)
+
+            settle: str = 'unsettled' if result['settle_time'] is None else f"settled {result['settle_time']:.2f}s"
+            print(
+                f"{len(results):>4}/{len(cases)} {result['scene']:<12} {result['backend']:<7} "
+                f"g={result['gravity']:<7g} sub={result['sub_steps']:<3} R={result['constraint_radius']:<6g} "
+                f"{result['steps_per_sec']:>9.2f} steps/s  E={result['total_energy']:.4g}  {settle}"
+            )
+
+    return results
+
+
+def main(argv=None):
+    parser = ArgumentParser(description='Verlet integration sandbox.')
+    parser.add_argument('--backend', choices=tuple(SOLVERS), default='python')
+    parser.add_argument('--sub-steps', type=int, default=8)
+    parser.add_argument('--fps', type=int, default=60, help='render rate')
+    parser.add_argument('--physics-fps', type=int, default=60, help='fixed physics step rate')
+    parser.add_argument('--sleep-threshold', type=float, default=0.0,
+                        help='per-sub-step displacement below which bodies may fall asleep (0 disables)')
+    parser.add_argument('--adaptive', action='store_true', help='choose the sub-step count every frame')
+    parser.add_argument('--max-sub-steps', type=int, default=16, help='upper bound for adaptive sub-stepping')
+    parser.add_argument('--workers', type=int, help='collision worker processes for the parallel backend (all cores by default)')
+    parser.add_argument('--slabs', type=int, help='collision slabs for the parallel backend (one per worker by default)')
+    parser.add_argument('--dtype', choices=('float64', 'float32'), default='float64',
+                        help='float storage for the numpy and parallel backends')
+    parser.add_argument('--field', action='append', default=[], metavar='KIND:VALUES',
+                        help='add a force field: uniform:AX,AY, attractor:X,Y,STRENGTH[,RADIUS], '
+                             'repulsor:X,Y,STRENGTH[,RADIUS], drag:K or vortex:SPEED[,CELL[,K]] (repeatable)')
+    parser.add_argument('--link-iterations', type=int, default=1, help='link relaxation passes per sub-step')
+    parser.add_argument('--bodies', type=int, default=0, help='number of random bodies to spawn')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random scene')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='step on a virtual clock, never drop steps and fix the parallel slab count')
+    parser.add_argument('--raster-threshold', type=int, default=2000,
+                        help='body count above which bodies are rasterized into one image (0 always rasterizes)')
+    parser.add_argument('--process', action='store_true',
+                        help='run the solver in a separate process and draw from shared memory')
+    parser.add_argument('--headless', action='store_true', help='step without a window and report steps/sec')
+    parser.add_argument('--steps', type=int, help='steps to run (600 headless, 30 per benchmark scene)')
+    parser.add_argument('--bench', nargs='*', metavar='SCENE', choices=tuple(BENCHMARKS),
+                        help='run the benchmark scenes (all if none are given)')
+    parser.add_argument('--output', help='file to write benchmark results to as JSON')
+    parser.add_argument('--load', metavar='SNAPSHOT', help='start from a saved snapshot instead of random bodies')
+    parser.add_argument('--save', metavar='SNAPSHOT', help='save a snapshot after the headless run')
+    parser.add_argument('--record', metavar='TRAJECTORY', help='record every headless frame to a trajectory file')
+    parser.add_argument('--stats', metavar='PATH', help='dump per-phase solver statistics as JSON after the headless run')
+    parser.add_argument('--telemetry', metavar='TARGET',
+                        help='periodically append per-frame telemetry as JSON lines to a file or unix:SOCKET')
+    parser.add_argument('--telemetry-every', type=float, default=1.0, help='seconds between telemetry exports')
+    parser.add_argument('--telemetry-size', type=int, default=3600, help='frames kept in the telemetry ring buffer')
+    parser.add_argument('--hashes', metavar='PATH', help='dump rolling state checksums as JSON after the headless run')
+    parser.add_argument('--hash-every', type=int, default=1, help='steps between state checksums')
+    parser.add_argument('--compare', nargs=2, metavar='BACKEND', choices=tuple(SOLVERS),
+                        help='step two backends side by side and report the first divergence')
+    parser.add_argument('--scene', choices=tuple(BENCHMARKS),
+                        help='benchmark scene to build instead of random bodies (pile-100 for --compare)')
+    parser.add_argument('--sweep', metavar='RESULTS', help='run a parameter sweep on a process pool, streaming JSON lines')
+    parser.add_argument('--grid', action='append', default=[], metavar='KEY=V1,V2',
+                        help=f'sweep values for one of: {", ".join(SWEEP_DEFAULTS)} (repeatable)')
+    parser.add_argument('--tolerance', type=float, default=1e-6, help='position error allowed by --compare')
+    args = parser.parse_args(argv)
+    if args.process and args.backend == 'parallel':
+        parser.error('--process cannot be combined with the parallel backend')
+
+    if args.dtype != 'float64':
+        if args.deterministic:
+            parser.error('--deterministic always steps in float64')
+        if args.sweep is None and set(args.compare or (args.backend,)) == {'python'}:
+            parser.error('--dtype needs the numpy or parallel backend')
+    parallel: dict = {'workers': args.workers, 'slabs': args.slabs or (8 if args.deterministic else None)}
+    options: dict = backend_options(args.backend, args.dtype, **parallel)
+
+    if args.bench is not None:
+        run_benchmarks(args.bench, args.backend, args.steps or 30, args.sub_steps, args.output, **options)
+        return None
+
+    if args.sweep is not None:
+        try:
+            values: dict = parse_grid(args.grid)
+        except ValueError as error:
+            parser.error(str(error))
+        if 'parallel' in values.get('backend', ()):
+            parser.error('the parallel backend cannot run inside sweep workers')
+        values.setdefault('dtype', [args.dtype])
+        run_sweep(sweep_grid(**values), args.sweep, args.workers)
+        return None
+
+    if args.compare is not None:
+        result: dict = compare_engines(
+            args.scene or 'pile-100', *args.compare, args.steps or 300, args.hash_every, args.tolerance, args.sub_steps,
+            args.fps, args.dtype, **parallel
+        )
+        if result is None:
+            print(f'{args.compare[0]} and {args.compare[1]} agree within {args.tolerance} on {args.scene or "pile-100"}')
+        else:
+            print('diverged at step {step}: body {body} off by {error:.6g}'.format(**result))
+        return None
+
+    if args.load is not None:
+        solver = load_snapshot(args.load, SOLVERS[args.backend], **options)
+    else:
+        solver = make_solver(
+            args.backend, args.sub_steps,
+            sleep_threshold=args.sleep_threshold, link_iterations=args.link_iterations,
+            adaptive=args.adaptive, max_sub_steps=args.max_sub_steps, **options
+        )
+        if args.scene is not None:
+            build, params = BENCHMARKS[args.scene]
+            build(solver, **params)
+        random_scene(solver, args.bodies, seed=args.seed)
+    try:
+        solver.forces += [parse_field(spec, solver) for spec in args.field]
+    except ValueError as error:
+        parser.error(str(error))
+
+    telemetry: Telemetry = Telemetry(args.telemetry_size, args.telemetry, args.telemetry_every)
+
+    if args.headless:
+        callbacks: list = []
+        hashes: StateHashes = StateHashes(args.hash_every)
+        if args.hashes is not None:
+            callbacks.append(hashes.record)
+
+        def on_frame(solver: Solver) -> None:
+            for callback in callbacks:
+                callback(solver)
+
+        if args.record is not None:
+            with TrajectoryRecorder(args.record, len(solver.objects)) as recorder:
+                callbacks.append(recorder.record)
+                print(f'{run_headless(solver, args.steps or 600, args.fps, on_frame, telemetry):.1f} steps/sec')
+        else:
+            print(f'{run_headless(solver, args.steps or 600, args.fps, on_frame, telemetry):.1f} steps/sec')
+        telemetry.close()
+
+        if args.save is not None:
+            save_snapshot(solver, args.save)
+        if args.stats is not None:
+            solver.stats.dump(args.stats)
+        if args.hashes is not None:
+            hashes.dump(args.hashes)
+        return None
+
+    if args.process:
+        solver = SolverProcess(solver, max_steps=None if args.deterministic else 5)
+
+    root = Root(
+        solver, args.fps, physics_fps=args.physics_fps, deterministic=args.deterministic,
+        raster_threshold=args.raster_threshold, telemetry=telemetry
+    )
+    try:
+        root.mainloop()
+    finally:
+        telemetry.close()
+        if args.process:
+            solver.close()
+
+
+if __name__ == '__main__':
+    main()